@@ -68,10 +68,16 @@ def _build_system_prompt() -> str:
 class SajuChatAgent:
     """사주팔자 AI 채팅 에이전트"""
 
-    def __init__(self, qdrant_host: str = "localhost", qdrant_port: int = 6333):
+    def __init__(
+        self,
+        qdrant_host: str = "localhost",
+        qdrant_port: int = 6333,
+        qdrant_grpc_port: int = 6334,
+    ):
         self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         self.qdrant_host = qdrant_host
         self.qdrant_port = qdrant_port
+        self.qdrant_grpc_port = qdrant_grpc_port
         self.sessions: dict[str, dict] = {}
 
     def create_session(self, session_id: str, analysis_text: str, analysis_data: dict):
@@ -82,6 +88,7 @@ class SajuChatAgent:
                 analysis_text,
                 qdrant_host=self.qdrant_host,
                 qdrant_port=self.qdrant_port,
+                qdrant_grpc_port=self.qdrant_grpc_port,
             )
         except Exception as e:
             print(f"[Agent] RAG retrieval failed (continuing without): {e}")
@@ -156,6 +163,7 @@ class SajuChatAgent:
                 user_message, top_k=2,
                 qdrant_host=self.qdrant_host,
                 qdrant_port=self.qdrant_port,
+                qdrant_grpc_port=self.qdrant_grpc_port,
             )
             if results:
                 extra_parts = ["\n[참고 방법론]"]
@@ -7,6 +7,7 @@
 
 import os
 import json as _json
+import queue
 import sqlite3
 import secrets
 import urllib.request
@@ -26,6 +27,23 @@ if _use_pg:
     import psycopg2.extras
 
 
+_SQLITE_PATH = Path(__file__).parent / "users.db"
+_SQLITE_POOL_SIZE = 5
+
+# SQLite 연결 풀: 요청마다 파일을 열고 닫지 않고 연결을 재사용
+_sqlite_pool: queue.Queue = queue.Queue(maxsize=_SQLITE_POOL_SIZE)
+
+
+def _new_sqlite_conn() -> sqlite3.Connection:
+    conn = sqlite3.connect(str(_SQLITE_PATH), check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    # 연결 단위 설정 (journal_mode=WAL은 init_db에서 DB 파일에 영구 적용)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=134217728")
+    return conn
+
+
 @contextmanager
 def _conn():
     if _use_pg:
@@ -40,14 +58,21 @@ def _conn():
         finally:
             conn.close()
     else:
-        db_path = Path(__file__).parent / "users.db"
-        conn = sqlite3.connect(str(db_path))
-        conn.row_factory = sqlite3.Row
+        try:
+            conn = _sqlite_pool.get_nowait()
+        except queue.Empty:
+            conn = _new_sqlite_conn()
         try:
             yield conn
             conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
         finally:
-            conn.close()
+            try:
+                _sqlite_pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
 
 
 def _fetchone(conn, query: str, params: tuple) -> dict | None:
@@ -94,6 +119,11 @@ def _q(sql: str) -> str:
 # ─────── 테이블 초기화 ───────
 
 def init_db():
+    if not _use_pg:
+        # WAL: 스트리밍 중 쓰기가 읽기를 막지 않도록 (DB 파일에 영구 저장되는 설정)
+        with _conn() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+
     with _conn() as conn:
         _execute(conn, """
             CREATE TABLE IF NOT EXISTS users (
@@ -6,16 +6,19 @@ import os
 import sys
 import uuid
 import json
+import time
 import asyncio
+import tempfile
 from pathlib import Path
 from contextlib import asynccontextmanager
 
 sys.path.insert(0, str(Path(__file__).parent))
 
+import orjson
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse, FileResponse, HTMLResponse
+from fastapi.responses import StreamingResponse, FileResponse, HTMLResponse, ORJSONResponse
 from pydantic import BaseModel, Field
 
 env_path = Path(__file__).parent.parent / ".env"
@@ -24,7 +27,8 @@ load_dotenv(dotenv_path=env_path)
 from saju.analyzer import full_analysis, analysis_to_text
 from saju.calculator import get_leap_month_for_year
 from agent.chat import SajuChatAgent
-from rag.embedder import embed_documents, COLLECTION_NAME
+from rag.embedder import embed_documents, COLLECTION_NAME, EMBEDDING_DIM
+from rag.retriever import rag_embedding
 from auth import (
     init_db, register_user, login_user, approve_user,
     get_user_role, set_user_role, list_users,
@@ -35,9 +39,78 @@ from auth import (
 
 QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
 QDRANT_PORT = int(os.getenv("QDRANT_PORT", "6333"))
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
 DATA_DIR = str(Path(__file__).parent.parent / "data")
 
-agent = SajuChatAgent(qdrant_host=QDRANT_HOST, qdrant_port=QDRANT_PORT)
+agent = SajuChatAgent(
+    qdrant_host=QDRANT_HOST,
+    qdrant_port=QDRANT_PORT,
+    qdrant_grpc_port=QDRANT_GRPC_PORT,
+)
+
+# 백그라운드 태스크 참조 보관 (GC로 중간 취소되는 것을 방지)
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _spawn_background(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+async def _warm_qdrant(qc) -> None:
+    """컬렉션 페이지와 HNSW 그래프를 미리 메모리에 올려 첫 검색의 콜드 스타트 지연을 제거."""
+    try:
+        await asyncio.to_thread(
+            qc.scroll, collection_name=COLLECTION_NAME, limit=500, with_vectors=False,
+        )
+        probe = [1.0] * EMBEDDING_DIM
+        for _ in range(3):
+            await asyncio.to_thread(
+                qc.query_points, collection_name=COLLECTION_NAME, query=probe, limit=1,
+            )
+        print("[Server] Qdrant cache warmed.")
+    except Exception as e:
+        print(f"[Server] Qdrant warm-up skipped: {e}")
+
+
+# 워커 간 자동 임베딩 중복 방지용 잠금 파일 (WORKERS > 1 이면 워커마다 lifespan이 실행됨)
+_EMBED_LOCK_PATH = Path(tempfile.gettempdir()) / f"{COLLECTION_NAME}.embed.lock"
+
+
+def _try_acquire_embed_lock():
+    """
+    자동 임베딩 잠금을 시도합니다. 획득하면 잠금 파일 객체, 다른 워커가 보유 중이면 None.
+    flock 잠금은 프로세스가 죽으면 자동 해제됩니다.
+    fcntl이 없는 환경(Windows 개발용 단일 워커)에서는 잠금 없이 진행합니다.
+    """
+    lock_file = open(_EMBED_LOCK_PATH, "w")
+    try:
+        import fcntl
+    except ImportError:
+        return lock_file
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+async def _embed_in_background(lock_file) -> None:
+    """방법론 문서 임베딩을 서버 시작과 분리하여 실행 (진행 중에는 RAG 없이 동작)."""
+    try:
+        count = await asyncio.to_thread(
+            embed_documents, DATA_DIR, QDRANT_HOST, QDRANT_PORT, QDRANT_GRPC_PORT
+        )
+        print(f"[Server] Embedded {count} chunks. RAG is ready.")
+    except Exception as e:
+        print(f"[Server] Background embedding failed: {e}")
+        print("[Server] Retrieval will be retried on each request.")
+    finally:
+        rag_embedding.clear()
+        lock_file.close()
 
 
 @asynccontextmanager
@@ -45,22 +118,32 @@ async def lifespan(app: FastAPI):
     print("[Server] Starting up...")
     init_db()
     print("[Server] User DB initialized.")
+    _load_static_files()
     try:
         from qdrant_client import QdrantClient
-        qc = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT, timeout=5)
-        collections = qc.get_collections().collections
-        names = [c.name for c in collections]
-
-        if COLLECTION_NAME not in names:
-            print("[Server] Embedding methodology documents into Qdrant...")
-            count = embed_documents(DATA_DIR, QDRANT_HOST, QDRANT_PORT)
-            print(f"[Server] Embedded {count} chunks.")
+        qc = QdrantClient(
+            host=QDRANT_HOST,
+            port=QDRANT_PORT,
+            grpc_port=QDRANT_GRPC_PORT,
+            prefer_grpc=True,
+            timeout=5,
+        )
+        if not qc.collection_exists(COLLECTION_NAME):
+            lock_file = _try_acquire_embed_lock()
+            if lock_file is None:
+                print("[Server] Another worker is embedding methodology documents.")
+            else:
+                print("[Server] Embedding methodology documents into Qdrant (background)...")
+                rag_embedding.set()
+                _spawn_background(_embed_in_background(lock_file))
         else:
             info = qc.get_collection(COLLECTION_NAME)
             print(f"[Server] Qdrant collection exists with {info.points_count} points.")
+            _spawn_background(_warm_qdrant(qc))
     except Exception as e:
+        # Qdrant가 API보다 늦게 뜨는 경우 등: 검색은 매 요청마다 재시도됨
         print(f"[Server] Qdrant initialization skipped: {e}")
-        print("[Server] The server will work without RAG context.")
+        print("[Server] Retrieval will be retried on each request.")
 
     yield
     print("[Server] Shutting down...")
@@ -71,23 +154,18 @@ app = FastAPI(
     description="사주팔자를 분석하고 AI가 해석해주는 에이전트 API",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "http://localhost:5173",
-        "http://localhost:3000",
-        "http://localhost:3005",
-        "http://localhost:3006",
-        "http://127.0.0.1:5173",
-        "http://127.0.0.1:3000",
-        "http://127.0.0.1:3005",
-        "https://sajugo.shop",
-        "https://www.sajugo.shop",
-    ],
+    allow_origin_regex=(
+        r"^http://localhost:(5173|3000|3005|3006)$"
+        r"|^http://127\.0\.0\.1:(5173|3000|3005)$"
+        r"|^https://(www\.)?sajugo\.shop$"
+    ),
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
     allow_headers=["*"],
 )
 
@@ -314,8 +392,32 @@ async def analyze(request: AnalyzeRequest):
         raise HTTPException(status_code=500, detail=f"분석 중 오류: {str(e)}")
 
 
-def _sse_event(data: dict) -> str:
-    return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+def _sse_event(data: dict) -> bytes:
+    return b"data: " + orjson.dumps(data) + b"\n\n"
+
+
+# 토큰마다 이벤트를 보내지 않고 N글자 또는 M초 단위로 묶어서 전송
+SSE_FLUSH_CHARS = 32
+SSE_FLUSH_INTERVAL = 0.05
+
+
+def _batched_sse(chunks, full_response: list[str]):
+    """LLM 청크를 모아 SSE delta 이벤트로 전송하고, 원문은 full_response에 누적."""
+    buf: list[str] = []
+    buf_len = 0
+    last = time.monotonic()
+    for chunk in chunks:
+        full_response.append(chunk)
+        buf.append(chunk)
+        buf_len += len(chunk)
+        now = time.monotonic()
+        if buf_len >= SSE_FLUSH_CHARS or now - last > SSE_FLUSH_INTERVAL:
+            yield _sse_event({"delta": "".join(buf)})
+            buf.clear()
+            buf_len = 0
+            last = now
+    if buf:
+        yield _sse_event({"delta": "".join(buf)})
 
 
 @app.post("/api/stream/reading")
@@ -328,14 +430,14 @@ async def stream_reading(request: StreamRequest):
     def generate():
         try:
             full_response = []
-            for chunk in agent.get_initial_reading_stream(request.session_id):
-                full_response.append(chunk)
-                yield _sse_event({"delta": chunk})
+            yield from _batched_sse(
+                agent.get_initial_reading_stream(request.session_id), full_response,
+            )
 
             if analysis_id:
                 save_chat_message(analysis_id, "assistant", "".join(full_response))
 
-            yield "data: [DONE]\n\n"
+            yield b"data: [DONE]\n\n"
         except Exception as e:
             yield _sse_event({"error": str(e)})
 
@@ -360,14 +462,14 @@ async def stream_chat(request: ChatRequest):
                 save_chat_message(analysis_id, "user", request.message)
 
             full_response = []
-            for chunk in agent.chat_stream(request.session_id, request.message):
-                full_response.append(chunk)
-                yield _sse_event({"delta": chunk})
+            yield from _batched_sse(
+                agent.chat_stream(request.session_id, request.message), full_response,
+            )
 
             if analysis_id:
                 save_chat_message(analysis_id, "assistant", "".join(full_response))
 
-            yield "data: [DONE]\n\n"
+            yield b"data: [DONE]\n\n"
         except Exception as e:
             yield _sse_event({"error": str(e)})
 
@@ -439,7 +541,7 @@ async def leap_month(year: int):
 async def embed_docs():
     try:
         count = await asyncio.to_thread(
-            embed_documents, DATA_DIR, QDRANT_HOST, QDRANT_PORT
+            embed_documents, DATA_DIR, QDRANT_HOST, QDRANT_PORT, QDRANT_GRPC_PORT
         )
         return {"status": "ok", "embedded_chunks": count}
     except Exception as e:
@@ -748,19 +850,37 @@ async def share_page(d: str = ""):
 # ─────── 프론트엔드 정적 파일 서빙 ───────
 STATIC_DIR = Path(__file__).parent / "static"
 
+# 빌드 산출물은 서버 실행 중 바뀌지 않으므로 시작 시 한 번만 스캔
+STATIC_FILES: dict[str, Path] = {}
+INDEX_FILE: Path | None = None
+
+
+def _load_static_files():
+    """정적 파일 목록을 메모리에 적재 (요청마다 stat() 호출 방지)."""
+    global INDEX_FILE
+    STATIC_FILES.clear()
+    INDEX_FILE = None
+    if not STATIC_DIR.is_dir():
+        return
+
+    for p in STATIC_DIR.rglob("*"):
+        if p.is_file():
+            STATIC_FILES[p.relative_to(STATIC_DIR).as_posix()] = p
+    INDEX_FILE = STATIC_FILES.get("index.html")
+    print(f"[Server] Loaded {len(STATIC_FILES)} static files.")
+
 
 @app.get("/{full_path:path}")
 async def serve_spa(full_path: str):
-    if not STATIC_DIR.exists():
+    if not STATIC_FILES:
         raise HTTPException(status_code=404, detail="Frontend not built. Run build.sh first.")
 
-    file_path = (STATIC_DIR / full_path).resolve()
-    if file_path.is_relative_to(STATIC_DIR.resolve()) and file_path.is_file():
+    file_path = STATIC_FILES.get(full_path)
+    if file_path is not None:
         return FileResponse(file_path)
 
-    index = STATIC_DIR / "index.html"
-    if index.is_file():
-        return FileResponse(index)
+    if INDEX_FILE is not None:
+        return FileResponse(INDEX_FILE)
 
     raise HTTPException(status_code=404)
 
@@ -768,4 +888,14 @@ async def serve_spa(full_path: str):
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", "5000"))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # 채팅 세션이 프로세스 메모리(agent.sessions)에 있으므로 기본은 단일 워커.
+    # 세션 저장소를 공유하기 전까지 WORKERS > 1 은 세션 유실을 일으킵니다.
+    workers = int(os.getenv("WORKERS", "1"))
+    uvicorn.run(
+        "main:app" if workers > 1 else app,
+        host="0.0.0.0",
+        port=port,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        workers=workers,
+    )
@@ -4,14 +4,16 @@ RAG Embedder: data/ 폴더의 마크다운 문서를 청킹하여 Qdrant에 임
 
 import os
 import re
-import hashlib
+import threading
 from pathlib import Path
 
+from blake3 import blake3
 from openai import OpenAI
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
     Distance, VectorParams, PointStruct,
     Filter, FieldCondition, MatchValue,
+    ScalarQuantization, ScalarQuantizationConfig, ScalarType,
 )
 
 
@@ -19,12 +21,53 @@ COLLECTION_NAME = "saju_methodology"
 EMBEDDING_MODEL = "text-embedding-3-small"
 EMBEDDING_DIM = 1536
 
+# 마크다운 제목 (# ~ ###) → (레벨, 제목)
+HEADING_RE = re.compile(r"^(#{1,3})\s+(.*)$")
+
+
+# 프로세스 전체에서 공유하는 클라이언트 (최초 사용 시 생성)
+# 요청마다 새로 만들면 gRPC 채널/HTTP2 핸드셰이크를 매번 다시 맺게 됩니다.
+_clients_lock = threading.Lock()
+_openai_client: OpenAI | None = None
+_qdrant_clients: dict[tuple[str, int, int], QdrantClient] = {}
+
+
+def get_openai_client() -> OpenAI:
+    """공유 OpenAI 클라이언트"""
+    global _openai_client
+    with _clients_lock:
+        if _openai_client is None:
+            _openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        return _openai_client
+
+
+def get_qdrant_client(
+    qdrant_host: str = "localhost",
+    qdrant_port: int = 6333,
+    qdrant_grpc_port: int = 6334,
+) -> QdrantClient:
+    """접속 대상별 공유 Qdrant 클라이언트 (gRPC 우선)"""
+    key = (qdrant_host, qdrant_port, qdrant_grpc_port)
+    with _clients_lock:
+        client = _qdrant_clients.get(key)
+        if client is None:
+            client = QdrantClient(
+                host=qdrant_host,
+                port=qdrant_port,
+                grpc_port=qdrant_grpc_port,
+                prefer_grpc=True,
+            )
+            _qdrant_clients[key] = client
+        return client
+
 
-def get_clients(qdrant_host: str = "localhost", qdrant_port: int = 6333):
-    """OpenAI 및 Qdrant 클라이언트 생성"""
-    openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    qdrant_client = QdrantClient(host=qdrant_host, port=qdrant_port)
-    return openai_client, qdrant_client
+def get_clients(
+    qdrant_host: str = "localhost",
+    qdrant_port: int = 6333,
+    qdrant_grpc_port: int = 6334,
+):
+    """공유 OpenAI 및 Qdrant 클라이언트 반환 (Qdrant는 gRPC 우선)"""
+    return get_openai_client(), get_qdrant_client(qdrant_host, qdrant_port, qdrant_grpc_port)
 
 
 def chunk_markdown(text: str, filename: str) -> list[dict]:
@@ -37,20 +80,23 @@ def chunk_markdown(text: str, filename: str) -> list[dict]:
     - 너무 짧은 청크는 이전 청크에 병합
     """
     chunks = []
-    lines = text.split("\n")
+    lines = text.splitlines()
 
     current_h1 = filename
     current_section_title = ""
     current_content = []
 
     for line in lines:
+        m = HEADING_RE.match(line)
+        level = len(m.group(1)) if m else 0
+
         # H1 제목
-        if line.startswith("# "):
-            current_h1 = line.strip("# ").strip()
+        if level == 1:
+            current_h1 = m.group(2).strip()
             continue
 
-        # H3 제목 (섹션 구분)
-        if line.startswith("### ") or line.startswith("## "):
+        # H2/H3 제목 (섹션 구분)
+        if level:
             # 이전 섹션 저장
             if current_content:
                 content_text = "\n".join(current_content).strip()
@@ -63,7 +109,7 @@ def chunk_markdown(text: str, filename: str) -> list[dict]:
                     })
                 current_content = []
 
-            current_section_title = line.strip("#").strip()
+            current_section_title = m.group(2).strip()
             current_content.append(line)
         else:
             current_content.append(line)
@@ -102,15 +148,21 @@ def embed_text(client: OpenAI, text: str) -> list[float]:
 
 def create_collection(qdrant: QdrantClient):
     """Qdrant 컬렉션 생성 (없으면)"""
-    collections = qdrant.get_collections().collections
-    names = [c.name for c in collections]
-
-    if COLLECTION_NAME not in names:
+    if not qdrant.collection_exists(COLLECTION_NAME):
         qdrant.create_collection(
             collection_name=COLLECTION_NAME,
             vectors_config=VectorParams(
                 size=EMBEDDING_DIM,
                 distance=Distance.COSINE,
+                on_disk=False,
+            ),
+            # FP32 → int8 스칼라 양자화: 벡터 메모리 1/4, 검색 처리량 향상
+            quantization_config=ScalarQuantization(
+                scalar=ScalarQuantizationConfig(
+                    type=ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=True,
+                ),
             ),
         )
         print(f"[Qdrant] Collection '{COLLECTION_NAME}' created.")
@@ -118,16 +170,22 @@ def create_collection(qdrant: QdrantClient):
         print(f"[Qdrant] Collection '{COLLECTION_NAME}' already exists.")
 
 
-def embed_documents(data_dir: str, qdrant_host: str = "localhost", qdrant_port: int = 6333):
+def embed_documents(
+    data_dir: str,
+    qdrant_host: str = "localhost",
+    qdrant_port: int = 6333,
+    qdrant_grpc_port: int = 6334,
+):
     """
     data/ 폴더의 모든 .md 파일을 임베딩하여 Qdrant에 저장합니다.
 
     Args:
         data_dir: 데이터 디렉토리 경로
         qdrant_host: Qdrant 호스트
-        qdrant_port: Qdrant 포트
+        qdrant_port: Qdrant HTTP 포트
+        qdrant_grpc_port: Qdrant gRPC 포트
     """
-    openai_client, qdrant_client = get_clients(qdrant_host, qdrant_port)
+    openai_client, qdrant_client = get_clients(qdrant_host, qdrant_port, qdrant_grpc_port)
     create_collection(qdrant_client)
 
     data_path = Path(data_dir)
@@ -151,7 +209,7 @@ def embed_documents(data_dir: str, qdrant_host: str = "localhost", qdrant_port:
             vector = embed_text(openai_client, embed_input)
 
             # 고유 ID 생성
-            content_hash = hashlib.md5(chunk["content"].encode()).hexdigest()
+            content_hash = blake3(chunk["content"].encode()).hexdigest()
             point_id_int = int(content_hash[:8], 16)
 
             point = PointStruct(
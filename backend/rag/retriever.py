@@ -2,11 +2,14 @@
 RAG Retriever: 쿼리를 기반으로 Qdrant에서 관련 방법론 문서를 검색합니다.
 """
 
-import os
-from openai import OpenAI
-from qdrant_client import QdrantClient
+import threading
 
-from .embedder import COLLECTION_NAME, EMBEDDING_MODEL
+from .embedder import COLLECTION_NAME, EMBEDDING_MODEL, get_clients
+
+# 이 프로세스에서 백그라운드 임베딩이 진행 중인 동안에만 검색을 건너뜀.
+# 그 외에는 매 요청마다 검색을 시도하므로, Qdrant가 API보다 늦게 뜨더라도
+# 준비되는 즉시 RAG가 동작합니다 (실패 시 빈 리스트).
+rag_embedding = threading.Event()
 
 
 def retrieve(
@@ -14,6 +17,7 @@ def retrieve(
     top_k: int = 3,
     qdrant_host: str = "localhost",
     qdrant_port: int = 6333,
+    qdrant_grpc_port: int = 6334,
 ) -> list[dict]:
     """
     쿼리와 관련된 사주 방법론 문서를 검색합니다.
@@ -22,13 +26,17 @@ def retrieve(
         query: 검색 쿼리 (자연어)
         top_k: 반환할 최대 결과 수
         qdrant_host: Qdrant 호스트
-        qdrant_port: Qdrant 포트
+        qdrant_port: Qdrant HTTP 포트
+        qdrant_grpc_port: Qdrant gRPC 포트
 
     Returns:
-        관련 문서 청크 리스트 (score, payload 포함)
+        관련 문서 청크 리스트 (score, payload 포함). 임베딩 진행 중에는 빈 리스트.
     """
-    openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    qdrant_client = QdrantClient(host=qdrant_host, port=qdrant_port)
+    if rag_embedding.is_set():
+        return []
+
+    # 프로세스 공유 클라이언트 재사용 (gRPC 채널을 요청마다 새로 맺지 않음)
+    openai_client, qdrant_client = get_clients(qdrant_host, qdrant_port, qdrant_grpc_port)
 
     # 쿼리 임베딩
     response = openai_client.embeddings.create(
@@ -3,6 +3,9 @@
 모든 분석 모듈을 순차 호출하여 최종 JSON 결과를 생성합니다.
 """
 
+from datetime import datetime
+from functools import lru_cache
+
 from .calculator import calculate_four_pillars
 from .elements import analyze_elements
 from .strength import analyze_strength
@@ -40,11 +43,37 @@ def full_analysis(
         is_leap_month: True이면 윤달(閏月)
 
     Returns:
-        모든 분석 결과를 통합한 딕셔너리
+        모든 분석 결과를 통합한 딕셔너리.
+        동일 입력에 대해 캐시된 결과를 공유하므로 반환값을 수정하지 마세요.
     """
+    # 세운/나이 계산이 올해 기준이므로 현재 연도도 캐시 키에 포함
+    result = _full_analysis_cached(
+        year, month, day, hour, minute, gender,
+        is_lunar, is_leap_month, datetime.now().year,
+    )
+    # 이름은 표시용이므로 캐시 키에서 제외하고 복사본에만 반영
+    return {
+        **result,
+        "eight_characters": {**result["eight_characters"], "name": name},
+    }
+
+
+@lru_cache(maxsize=1024)
+def _full_analysis_cached(
+    year: int,
+    month: int,
+    day: int,
+    hour: int,
+    minute: int,
+    gender: str,
+    is_lunar: bool,
+    is_leap_month: bool,
+    current_year: int,
+) -> dict:
+    """이름을 제외한 입력과 현재 연도를 키로 전체 분석 결과를 메모이즈합니다."""
     # Phase 1: 사주 8자 계산
     pillars = calculate_four_pillars(
-        year, month, day, hour, minute, gender, name,
+        year, month, day, hour, minute, gender,
         is_lunar=is_lunar, is_leap_month=is_leap_month,
     )
 
@@ -81,6 +110,18 @@ def full_analysis(
     }
 
 
+# ─────── analysis_to_text 용 고정 테이블 ───────
+
+_PILLAR_POS_KO = (("year", "연주"), ("month", "월주"), ("day", "일주"), ("time", "시주"))
+_ELEMENT_ORDER = ("木", "火", "土", "金", "水")
+_TEN_GOD_KEYS = (
+    "year_stem", "month_stem", "day_stem", "time_stem",
+    "year_branch", "month_branch", "day_branch", "time_branch",
+)
+# 오행 비율 막대: 5% 당 한 칸 (0~100% → 0~20칸)
+_BARS = tuple("█" * n for n in range(21))
+
+
 def analysis_to_text(result: dict) -> str:
     """
     분석 결과를 사람이 읽을 수 있는 텍스트로 변환합니다.
@@ -95,101 +136,100 @@ def analysis_to_text(result: dict) -> str:
     fa = result["fortune_analysis"]
 
     lines = []
+    add = lines.append
 
     # 기본 정보
-    lines.append(f"=== 사주팔자 분석 결과 ===")
-    lines.append(f"이름: {ec['name']}")
-    lines.append(f"성별: {ec['gender']}")
-    lines.append(f"양력: {ec['solar_date']}")
-    lines.append(f"음력: {ec['lunar_date']}")
-    lines.append(f"계절: {ec['season']}")
-    lines.append("")
+    add(f"=== 사주팔자 분석 결과 ===")
+    add(f"이름: {ec['name']}")
+    add(f"성별: {ec['gender']}")
+    add(f"양력: {ec['solar_date']}")
+    add(f"음력: {ec['lunar_date']}")
+    add(f"계절: {ec['season']}")
+    add("")
 
     # 사주 원국
-    lines.append("【 사주 원국 (四柱原局) 】")
-    for pos in ["year", "month", "day", "time"]:
+    add("【 사주 원국 (四柱原局) 】")
+    for pos, pos_ko in _PILLAR_POS_KO:
         p = ec["pillars"][pos]
-        pos_ko = {"year": "연주", "month": "월주", "day": "일주", "time": "시주"}[pos]
-        lines.append(
+        add(
             f"  {pos_ko}: {p['ganzi']}({p['ganzi_ko']}) "
             f"[{p['stem_element']}/{p['branch_element']}] "
             f"납음: {p['nayin']}"
         )
-    lines.append("")
+    add("")
 
     # 일간
     ds = ec["day_stem"]
-    lines.append(f"【 일간(日干) 】: {ds['stem']}({ds['stem_ko']}) - {ds['element']}({ds['polarity']})")
-    lines.append("")
+    add(f"【 일간(日干) 】: {ds['stem']}({ds['stem_ko']}) - {ds['element']}({ds['polarity']})")
+    add("")
 
     # 오행 분석
-    lines.append("【 오행 분포 】")
-    for elem in ["木", "火", "土", "金", "水"]:
+    add("【 오행 분포 】")
+    for elem in _ELEMENT_ORDER:
         s = ea["element_stats"][elem]
-        bar = "█" * int(s["ratio"] / 5) if s["ratio"] > 0 else ""
-        lines.append(f"  {s['element_ko']}({elem}): {s['score']:5.1f}점 ({s['ratio']:4.1f}%) {bar}")
-    lines.append(f"  최강: {ea['strongest_element']}  최약: {ea['weakest_element']}")
+        bar = _BARS[int(s["ratio"] / 5)] if s["ratio"] > 0 else ""
+        add(f"  {s['element_ko']}({elem}): {s['score']:5.1f}점 ({s['ratio']:4.1f}%) {bar}")
+    add(f"  최강: {ea['strongest_element']}  최약: {ea['weakest_element']}")
     if ea["missing_elements"]:
-        lines.append(f"  부족한 오행: {', '.join(ea['missing_elements'])}")
-    lines.append("")
+        add(f"  부족한 오행: {', '.join(ea['missing_elements'])}")
+    add("")
 
     # 신강/신약
-    lines.append(f"【 신강/신약 판단 】: {sa['strength_status']}")
-    lines.append(f"  일간 세력 비율: {sa['analysis']['self_support_ratio']}%")
-    lines.append(f"  득령: {'○' if sa['analysis']['is_deuk_ryeong'] else '✕'} | "
-                 f"득지: {'○' if sa['analysis']['is_deuk_ji'] else '✕'} | "
-                 f"득세: {'○' if sa['analysis']['is_deuk_se'] else '✕'}")
-    lines.append(f"  {sa['description']}")
-    lines.append("")
+    add(f"【 신강/신약 판단 】: {sa['strength_status']}")
+    add(f"  일간 세력 비율: {sa['analysis']['self_support_ratio']}%")
+    add(f"  득령: {'○' if sa['analysis']['is_deuk_ryeong'] else '✕'} | "
+        f"득지: {'○' if sa['analysis']['is_deuk_ji'] else '✕'} | "
+        f"득세: {'○' if sa['analysis']['is_deuk_se'] else '✕'}")
+    add(f"  {sa['description']}")
+    add("")
 
     # 십성
-    lines.append("【 십성 배치 】")
+    add("【 십성 배치 】")
     tgm = tg["ten_god_map"]
-    for key in ["year_stem", "month_stem", "day_stem", "time_stem",
-                "year_branch", "month_branch", "day_branch", "time_branch"]:
+    for key in _TEN_GOD_KEYS:
         info = tgm[key]
-        lines.append(f"  {info['position']}: {info['char']}({info['char_ko']}) → {info['ten_god']}")
-    lines.append(f"  주도 십성: {tg['dominant_category']}")
-    lines.append(f"  해석: {tg['interpretation']}")
-    lines.append("")
+        add(f"  {info['position']}: {info['char']}({info['char_ko']}) → {info['ten_god']}")
+    add(f"  주도 십성: {tg['dominant_category']}")
+    add(f"  해석: {tg['interpretation']}")
+    add("")
 
     # 합충형파
     if ia["interactions"]:
-        lines.append("【 합충형파 】")
+        add("【 합충형파 】")
         for inter in ia["interactions"]:
-            lines.append(f"  [{inter['type']}] {inter['description']}")
-        lines.append("")
+            add(f"  [{inter['type']}] {inter['description']}")
+        add("")
 
     # 용신
-    lines.append(f"【 용신 선정 】")
-    lines.append(f"  용신(用神): {ys['yong_shin']}({ys['yong_shin_ko']})")
-    lines.append(f"  희신(喜神): {ys['hee_shin']}({ys['hee_shin_ko']})")
-    lines.append(f"  기신(忌神): {ys['gi_shin']}({ys['gi_shin_ko']})")
-    lines.append(f"  선정 방법: {ys['selection_method']}")
-    lines.append(f"  근거: {ys['selection_reason']}")
-    lines.append("")
+    add(f"【 용신 선정 】")
+    add(f"  용신(用神): {ys['yong_shin']}({ys['yong_shin_ko']})")
+    add(f"  희신(喜神): {ys['hee_shin']}({ys['hee_shin_ko']})")
+    add(f"  기신(忌神): {ys['gi_shin']}({ys['gi_shin_ko']})")
+    add(f"  선정 방법: {ys['selection_method']}")
+    add(f"  근거: {ys['selection_reason']}")
+    add("")
 
     # 추천
     rec = ys["recommendations"]
-    lines.append("【 생활 추천 】")
-    lines.append(f"  행운색: {', '.join(rec['lucky_colors'])}")
-    lines.append(f"  행운 방위: {rec['lucky_direction']}")
-    lines.append(f"  행운 숫자: {', '.join(map(str, rec['lucky_numbers']))}")
-    lines.append(f"  적합 직업: {rec['career_advice']}")
-    lines.append("")
+    add("【 생활 추천 】")
+    add(f"  행운색: {', '.join(rec['lucky_colors'])}")
+    add(f"  행운 방위: {rec['lucky_direction']}")
+    add(f"  행운 숫자: {', '.join(map(str, rec['lucky_numbers']))}")
+    add(f"  적합 직업: {rec['career_advice']}")
+    add("")
 
     # 대운
-    lines.append("【 대운(大運) 】")
-    lines.append(f"  대운 시작: {fa['yun_info']['start_year']}년 {fa['yun_info']['start_month']}개월")
-    lines.append(f"  진행 방향: {fa['yun_info']['direction']}")
+    add("【 대운(大運) 】")
+    add(f"  대운 시작: {fa['yun_info']['start_year']}년 {fa['yun_info']['start_month']}개월")
+    add(f"  진행 방향: {fa['yun_info']['direction']}")
     if fa["current_da_yun"]:
         cd = fa["current_da_yun"]
-        lines.append(f"  현재 대운: {cd['ganzi']}({cd['ganzi_ko']}) [{cd['start_age']}~{cd['end_age']}세] - {cd['rating']} ({cd['score']}점)")
-    lines.append("")
+        add(f"  현재 대운: {cd['ganzi']}({cd['ganzi_ko']}) [{cd['start_age']}~{cd['end_age']}세] - {cd['rating']} ({cd['score']}점)")
+    add("")
 
     # 세운
-    lines.append("【 세운(歲運) - 향후 6년 】")
+    add("【 세운(歲運) - 향후 6년 】")
     for yf in fa["yearly_fortunes"]:
-        lines.append(f"  {yf['year']}년 {yf['ganzi']}({yf['ganzi_ko']}): {yf['rating']} ({yf['score']}점) - {yf['summary']}")
+        add(f"  {yf['year']}년 {yf['ganzi']}({yf['ganzi_ko']}): {yf['rating']} ({yf['score']}점) - {yf['summary']}")
 
     return "\n".join(lines)
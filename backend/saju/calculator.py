@@ -4,19 +4,28 @@ lunar_python 라이브러리를 활용한 만세력 기반 정확한 간지 계
 양력/음력 입력 및 윤달(閏月) 처리를 지원합니다.
 """
 
-from dataclasses import dataclass, field
-from typing import Optional
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from typing import Any, Optional
 from lunar_python import Solar, Lunar, LunarYear
 
 from .constants import (
-    HIDDEN_STEMS, STEM_KO, BRANCH_KO, STEM_ELEMENT, BRANCH_ELEMENT,
-    STEM_POLARITY, BRANCH_POLARITY, NAYIN, BRANCH_SEASON,
+    STEM_KO, BRANCH_KO, STEM_ELEMENT, BRANCH_ELEMENT,
+    BRANCH_SEASON, PILLAR_ATTRS,
+    STEM_IDX, BRANCH_IDX,
 )
 
 
-@dataclass
+# PILLAR_ATTRS 튜플 순서와 동일한 Pillar 파생 필드
+_PILLAR_ATTR_FIELDS = (
+    "stem_ko", "branch_ko", "stem_element", "branch_element",
+    "stem_polarity", "branch_polarity", "hidden_stems", "nayin",
+)
+
+
+@dataclass(slots=True, frozen=True)
 class Pillar:
-    """간지 한 쌍 (천간 + 지지)"""
+    """간지 한 쌍 (천간 + 지지). 60갑자 조합만 허용하며, 그 외에는 ValueError."""
     stem: str          # 천간 (한자)
     branch: str        # 지지 (한자)
     stem_ko: str = ""  # 천간 (한글)
@@ -27,17 +36,18 @@ class Pillar:
     branch_polarity: str = ""
     hidden_stems: list = field(default_factory=list)
     nayin: str = ""
+    # to_dict 결과 캐시 (불변 객체이므로 최초 1회만 생성)
+    _dict: Optional[dict] = field(init=False, default=None, repr=False, compare=False)
 
     def __post_init__(self):
-        self.stem_ko = STEM_KO.get(self.stem, "")
-        self.branch_ko = BRANCH_KO.get(self.branch, "")
-        self.stem_element = STEM_ELEMENT.get(self.stem, "")
-        self.branch_element = BRANCH_ELEMENT.get(self.branch, "")
-        self.stem_polarity = STEM_POLARITY.get(self.stem, "")
-        self.branch_polarity = BRANCH_POLARITY.get(self.branch, "")
-        self.hidden_stems = HIDDEN_STEMS.get(self.branch, [])
-        gz = self.stem + self.branch
-        self.nayin = NAYIN.get(gz, "")
+        attrs = PILLAR_ATTRS.get(self.stem + self.branch)
+        if attrs is None:
+            # 60갑자 조합만 허용 (FourPillars.indices 등 파생 값이 유효한 간지를 전제)
+            raise ValueError(f"Invalid ganzi: {self.stem + self.branch!r}")
+
+        # frozen 이므로 object.__setattr__로 파생 필드 채움
+        for name, value in zip(_PILLAR_ATTR_FIELDS, attrs):
+            object.__setattr__(self, name, value)
 
     @property
     def ganzi(self) -> str:
@@ -48,7 +58,11 @@ class Pillar:
         return self.stem_ko + self.branch_ko
 
     def to_dict(self) -> dict:
-        return {
+        """직렬화용 dict (캐시된 객체를 공유하므로 수정하지 마세요)"""
+        if self._dict is not None:
+            return self._dict
+
+        d = {
             "stem": self.stem,
             "branch": self.branch,
             "stem_ko": self.stem_ko,
@@ -65,9 +79,11 @@ class Pillar:
             ],
             "nayin": self.nayin,
         }
+        object.__setattr__(self, "_dict", d)
+        return d
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FourPillars:
     """사주 4주 (연주/월주/일주/시주)"""
     year: Pillar
@@ -81,9 +97,25 @@ class FourPillars:
     season: str = ""
     is_lunar_input: bool = False      # 음력 입력 여부
     is_leap_month: bool = False       # 윤달 여부
+    # 8자의 정수 인덱스 (constants.POSITIONS 순서: 연간, 연지, 월간, 월지, 일간, 일지, 시간, 시지)
+    indices: tuple = field(init=False, default=(), repr=False, compare=False)
+    # 일간 오행 (여러 분석 단계에서 공통으로 사용)
+    day_element: str = field(init=False, default="", repr=False, compare=False)
+    # lunar_python EightChar (대운 계산 재사용용, 직렬화하지 않음)
+    _ba_zi: Any = field(default=None, repr=False, compare=False)
+    # to_dict 결과 캐시 (불변 객체이므로 최초 1회만 생성)
+    _dict: Optional[dict] = field(init=False, default=None, repr=False, compare=False)
 
     def __post_init__(self):
-        self.season = BRANCH_SEASON.get(self.month.branch, "")
+        object.__setattr__(self, "season", BRANCH_SEASON.get(self.month.branch, ""))
+        # Pillar가 60갑자 조합만 허용하므로 인덱스 조회는 항상 성공
+        object.__setattr__(self, "indices", (
+            STEM_IDX[self.year.stem], BRANCH_IDX[self.year.branch],
+            STEM_IDX[self.month.stem], BRANCH_IDX[self.month.branch],
+            STEM_IDX[self.day.stem], BRANCH_IDX[self.day.branch],
+            STEM_IDX[self.time.stem], BRANCH_IDX[self.time.branch],
+        ))
+        object.__setattr__(self, "day_element", self.day.stem_element)
 
     @property
     def day_stem(self) -> str:
@@ -103,7 +135,11 @@ class FourPillars:
         return self.all_stems() + self.all_branches()
 
     def to_dict(self) -> dict:
-        return {
+        """직렬화용 dict (캐시된 객체를 공유하므로 수정하지 마세요)"""
+        if self._dict is not None:
+            return self._dict
+
+        d = {
             "name": self.name,
             "gender": self.gender,
             "solar_date": self.solar_date,
@@ -124,6 +160,8 @@ class FourPillars:
                 "polarity": self.day.stem_polarity,
             },
         }
+        object.__setattr__(self, "_dict", d)
+        return d
 
 
 def calculate_four_pillars(
@@ -153,8 +191,26 @@ def calculate_four_pillars(
         is_leap_month: True이면 해당 월이 윤달(閏月)
 
     Returns:
-        FourPillars 객체
+        FourPillars 객체 (Pillar 객체는 캐시와 공유되므로 수정하지 마세요)
     """
+    # 성별/이름은 간지 계산과 무관하므로 캐시 키에서 제외하고 사본에만 반영
+    pillars = _calculate_four_pillars_cached(
+        year, month, day, hour, minute, is_lunar, is_leap_month,
+    )
+    return replace(pillars, gender=gender, name=name)
+
+
+@lru_cache(maxsize=2048)
+def _calculate_four_pillars_cached(
+    year: int,
+    month: int,
+    day: int,
+    hour: int,
+    minute: int,
+    is_lunar: bool,
+    is_leap_month: bool,
+) -> FourPillars:
+    """날짜/시각 입력만을 키로 lunar_python 간지 계산 결과를 메모이즈합니다."""
     if is_lunar:
         # 음력 입력: Lunar 객체로 생성 후 Solar로 변환
         # 윤달인 경우 month를 음수로 전달 (lunar_python 규칙)
@@ -190,13 +246,13 @@ def calculate_four_pillars(
         time=time_pillar,
         solar_date=solar_str,
         lunar_date=lunar_str,
-        gender=gender,
-        name=name,
         is_lunar_input=is_lunar,
         is_leap_month=is_leap_month,
+        _ba_zi=ba_zi,
     )
 
 
+@lru_cache(maxsize=256)
 def get_leap_month_for_year(year: int) -> int:
     """
     해당 음력 연도에 윤달이 있는지 확인합니다.
@@ -227,15 +283,30 @@ def get_yun_data(
     대운 정보를 계산합니다.
 
     Returns:
-        대운 리스트와 시작 정보를 포함한 딕셔너리
+        대운 리스트와 시작 정보를 포함한 딕셔너리.
+        동일 입력에 대해 캐시된 결과를 공유하므로 반환값을 수정하지 마세요.
     """
-    if is_lunar:
-        lunar_month = -month if is_leap_month else month
-        lunar = Lunar.fromYmdHms(year, lunar_month, day, hour, minute, 0)
-    else:
-        solar = Solar(year, month, day, hour, minute, 0)
-        lunar = solar.getLunar()
-    ba_zi = lunar.getEightChar()
+    return _get_yun_data_cached(
+        year, month, day, hour, minute, gender, is_lunar, is_leap_month,
+    )
+
+
+@lru_cache(maxsize=2048)
+def _get_yun_data_cached(
+    year: int,
+    month: int,
+    day: int,
+    hour: int,
+    minute: int,
+    gender: str,
+    is_lunar: bool,
+    is_leap_month: bool,
+) -> dict:
+    """정규화된 위치 인자를 키로 대운 계산 결과를 메모이즈합니다."""
+    # 사주 계산 캐시의 EightChar를 재사용 (Solar/Lunar 재생성 방지)
+    ba_zi = _calculate_four_pillars_cached(
+        year, month, day, hour, minute, is_lunar, is_leap_month,
+    )._ba_zi
 
     # gender: 1 = 남, 0 = 여
     gender_code = 1 if gender == "남" else 0
@@ -256,17 +327,26 @@ def get_yun_data(
         stem = ganzi[0] if ganzi else ""
         branch = ganzi[1] if len(ganzi) > 1 else ""
 
+        attrs = PILLAR_ATTRS.get(ganzi)
+        if attrs is not None:
+            stem_ko, branch_ko, stem_element, branch_element = attrs[:4]
+        else:
+            stem_ko = STEM_KO.get(stem, "")
+            branch_ko = BRANCH_KO.get(branch, "")
+            stem_element = STEM_ELEMENT.get(stem, "")
+            branch_element = BRANCH_ELEMENT.get(branch, "")
+
         da_yun_list.append({
             "start_age": dy.getStartAge(),
             "end_age": dy.getEndAge(),
             "stem": stem,
             "branch": branch,
             "ganzi": ganzi,
-            "stem_ko": STEM_KO.get(stem, ""),
-            "branch_ko": BRANCH_KO.get(branch, ""),
-            "ganzi_ko": STEM_KO.get(stem, "") + BRANCH_KO.get(branch, ""),
-            "stem_element": STEM_ELEMENT.get(stem, ""),
-            "branch_element": BRANCH_ELEMENT.get(branch, ""),
+            "stem_ko": stem_ko,
+            "branch_ko": branch_ko,
+            "ganzi_ko": stem_ko + branch_ko,
+            "stem_element": stem_element,
+            "branch_element": branch_element,
         })
 
     return {
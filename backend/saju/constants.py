@@ -3,6 +3,8 @@
 천간(天干), 지지(地支), 오행(五行), 십성(十星), 합충형파 테이블
 """
 
+from types import MappingProxyType
+
 # ──────────────────────────── 오행 (Five Elements) ────────────────────────────
 
 ELEMENTS = ["木", "火", "土", "金", "水"]
@@ -11,13 +13,18 @@ ELEMENT_EN = {"木": "Wood", "火": "Fire", "土": "Earth", "金": "Metal", "水
 
 # 오행 상생 (생하는 관계): 木→火→土→金→水→木
 ELEMENT_GENERATES = {"木": "火", "火": "土", "土": "金", "金": "水", "水": "木"}
+# 역방향 상생 (나를 생하는 오행): 火←木, 土←火, ...
+ELEMENT_GENERATED_BY = {v: k for k, v in ELEMENT_GENERATES.items()}
 
 # 오행 상극 (극하는 관계): 木→土→水→火→金→木
 ELEMENT_CONTROLS = {"木": "土", "土": "水", "水": "火", "火": "金", "金": "木"}
+# 역방향 상극 (나를 극하는 오행): 土←木, 水←土, ...
+ELEMENT_CONTROLLED_BY = {v: k for k, v in ELEMENT_CONTROLS.items()}
 
 # ──────────────────────────── 천간 (Heavenly Stems) ──────────────────────────
 
 HEAVENLY_STEMS = ["甲", "乙", "丙", "丁", "戊", "己", "庚", "辛", "壬", "癸"]
+STEM_IDX = {s: i for i, s in enumerate(HEAVENLY_STEMS)}
 STEM_KO = {
     "甲": "갑", "乙": "을", "丙": "병", "丁": "정", "戊": "무",
     "己": "기", "庚": "경", "辛": "신", "壬": "임", "癸": "계",
@@ -39,6 +46,7 @@ STEM_POLARITY = {
 # ──────────────────────────── 지지 (Earthly Branches) ────────────────────────
 
 EARTHLY_BRANCHES = ["子", "丑", "寅", "卯", "辰", "巳", "午", "未", "申", "酉", "戌", "亥"]
+BRANCH_IDX = {b: i for i, b in enumerate(EARTHLY_BRANCHES)}
 BRANCH_KO = {
     "子": "자", "丑": "축", "寅": "인", "卯": "묘", "辰": "진", "巳": "사",
     "午": "오", "未": "미", "申": "신", "酉": "유", "戌": "술", "亥": "해",
@@ -54,6 +62,13 @@ BRANCH_POLARITY = {
     "午": "양", "未": "음", "申": "양", "酉": "음", "戌": "양", "亥": "음",
 }
 
+# 천간/지지 → 오행 (천간과 지지 글자는 겹치지 않음)
+CHAR_ELEMENT = {**STEM_ELEMENT, **BRANCH_ELEMENT}
+
+# 천간/지지 인덱스 → 오행 인덱스 (ELEMENTS 순서)
+STEM_ELEMENT_IDX = tuple(ELEMENTS.index(STEM_ELEMENT[s]) for s in HEAVENLY_STEMS)
+BRANCH_ELEMENT_IDX = tuple(ELEMENTS.index(BRANCH_ELEMENT[b]) for b in EARTHLY_BRANCHES)
+
 # 지지 계절 매핑
 BRANCH_SEASON = {
     "寅": "봄", "卯": "봄", "辰": "환절기",
@@ -79,6 +94,23 @@ HIDDEN_STEMS = {
     "亥": [("壬", 20), ("甲", 10)],
 }
 
+# 지지 → ELEMENTS 순서의 지장간 오행 비율 (일수 기준 정규화, 합계 1.0)
+BRANCH_HIDDEN_NORMALIZED = {}
+for _branch, _hidden in HIDDEN_STEMS.items():
+    _total_days = sum(d for _, d in _hidden)
+    _ratios = [0.0] * len(ELEMENTS)
+    for _stem, _days in _hidden:
+        _ratios[ELEMENTS.index(STEM_ELEMENT[_stem])] += _days / _total_days
+    BRANCH_HIDDEN_NORMALIZED[_branch] = tuple(_ratios)
+
+# 지지 인덱스 → 지장간 천간 인덱스 / 일수 (본기부터, EARTHLY_BRANCHES 순서의 병렬 튜플)
+HIDDEN_STEM_IDX = tuple(
+    tuple(STEM_IDX[s] for s, _ in HIDDEN_STEMS[b]) for b in EARTHLY_BRANCHES
+)
+HIDDEN_STEM_DAYS = tuple(
+    tuple(d for _, d in HIDDEN_STEMS[b]) for b in EARTHLY_BRANCHES
+)
+
 # ──────────────────────────── 60갑자 (Sexagenary Cycle) ──────────────────────
 
 SIXTY_JIAZI = []
@@ -116,82 +148,91 @@ TEN_GOD_CATEGORY = {
     "편인": "인성", "정인": "인성",
 }
 
+# ──────────────────────────── 조합 테이블 키 (Combination Keys) ─────────────
+
+def pair_key(a: str, b: str) -> tuple:
+    """두 글자 조합 테이블의 키 (순서 무관하도록 정렬된 2-튜플)"""
+    return (a, b) if a <= b else (b, a)
+
+
+# 세 글자 조합(삼합/방합/삼형)은 전통 순서의 튜플로 두고 포함 여부로 판정합니다.
+
 # ──────────────────────────── 천간합 (Heavenly Stem Combinations) ────────────
 
 # 갑기합토, 을경합금, 병신합수, 정임합목, 무계합화
 STEM_COMBINATIONS = {
-    frozenset(["甲", "己"]): "土",
-    frozenset(["乙", "庚"]): "金",
-    frozenset(["丙", "辛"]): "水",
-    frozenset(["丁", "壬"]): "木",
-    frozenset(["戊", "癸"]): "火",
+    pair_key("甲", "己"): "土",
+    pair_key("乙", "庚"): "金",
+    pair_key("丙", "辛"): "水",
+    pair_key("丁", "壬"): "木",
+    pair_key("戊", "癸"): "火",
 }
 
 # ──────────────────────────── 지지육합 (Six Branch Combinations) ─────────────
 
 BRANCH_SIX_COMBINATIONS = {
-    frozenset(["子", "丑"]): "土",
-    frozenset(["寅", "亥"]): "木",
-    frozenset(["卯", "戌"]): "火",
-    frozenset(["辰", "酉"]): "金",
-    frozenset(["巳", "申"]): "水",
-    frozenset(["午", "未"]): "土",
+    pair_key("子", "丑"): "土",
+    pair_key("寅", "亥"): "木",
+    pair_key("卯", "戌"): "火",
+    pair_key("辰", "酉"): "金",
+    pair_key("巳", "申"): "水",
+    pair_key("午", "未"): "土",
 }
 
 # ──────────────────────────── 삼합 (Three Harmony) ──────────────────────────
 
 BRANCH_THREE_HARMONY = {
-    frozenset(["申", "子", "辰"]): "水",
-    frozenset(["亥", "卯", "未"]): "木",
-    frozenset(["寅", "午", "戌"]): "火",
-    frozenset(["巳", "酉", "丑"]): "金",
+    ("申", "子", "辰"): "水",
+    ("亥", "卯", "未"): "木",
+    ("寅", "午", "戌"): "火",
+    ("巳", "酉", "丑"): "金",
 }
 
 # ──────────────────────────── 방합 (Directional Harmony) ────────────────────
 
 BRANCH_DIRECTIONAL = {
-    frozenset(["寅", "卯", "辰"]): "木",
-    frozenset(["巳", "午", "未"]): "火",
-    frozenset(["申", "酉", "戌"]): "金",
-    frozenset(["亥", "子", "丑"]): "水",
+    ("寅", "卯", "辰"): "木",
+    ("巳", "午", "未"): "火",
+    ("申", "酉", "戌"): "金",
+    ("亥", "子", "丑"): "水",
 }
 
 # ──────────────────────────── 지충 (Branch Clashes) ─────────────────────────
 
 BRANCH_CLASHES = {
-    frozenset(["子", "午"]),
-    frozenset(["丑", "未"]),
-    frozenset(["寅", "申"]),
-    frozenset(["卯", "酉"]),
-    frozenset(["辰", "戌"]),
-    frozenset(["巳", "亥"]),
+    pair_key("子", "午"),
+    pair_key("丑", "未"),
+    pair_key("寅", "申"),
+    pair_key("卯", "酉"),
+    pair_key("辰", "戌"),
+    pair_key("巳", "亥"),
 }
 
 # ──────────────────────────── 지형 (Branch Punishments) ─────────────────────
 
 BRANCH_PUNISHMENTS = {
     # 삼형 (무례지형)
-    frozenset(["寅", "巳", "申"]): "무례지형",
+    ("寅", "巳", "申"): "무례지형",
     # 삼형 (은혜지형)
-    frozenset(["丑", "戌", "未"]): "은혜지형",
+    ("丑", "戌", "未"): "은혜지형",
     # 자형
-    frozenset(["子", "卯"]): "무례지형",
+    pair_key("子", "卯"): "무례지형",
     # 자형 (자기형)
-    frozenset(["午", "午"]): "자형",
-    frozenset(["辰", "辰"]): "자형",
-    frozenset(["酉", "酉"]): "자형",
-    frozenset(["亥", "亥"]): "자형",
+    pair_key("午", "午"): "자형",
+    pair_key("辰", "辰"): "자형",
+    pair_key("酉", "酉"): "자형",
+    pair_key("亥", "亥"): "자형",
 }
 
 # ──────────────────────────── 지파 (Branch Breaks) ──────────────────────────
 
 BRANCH_BREAKS = {
-    frozenset(["子", "酉"]),
-    frozenset(["丑", "辰"]),
-    frozenset(["寅", "亥"]),
-    frozenset(["卯", "午"]),
-    frozenset(["巳", "申"]),
-    frozenset(["未", "戌"]),
+    pair_key("子", "酉"),
+    pair_key("丑", "辰"),
+    pair_key("寅", "亥"),
+    pair_key("卯", "午"),
+    pair_key("巳", "申"),
+    pair_key("未", "戌"),
 }
 
 # ──────────────────────────── 월건 (Monthly Stems) ──────────────────────────
@@ -240,6 +281,13 @@ POSITION_WEIGHTS = {
     "time_branch": 10,
 }
 
+# 위치 고정 순서 (FourPillars.indices 와 동일) 및 그 순서의 가중치 벡터
+POSITIONS = (
+    "year_stem", "year_branch", "month_stem", "month_branch",
+    "day_stem", "day_branch", "time_stem", "time_branch",
+)
+POSITION_WEIGHTS_VEC = tuple(POSITION_WEIGHTS[p] for p in POSITIONS)
+
 # ──────────────────────────── 조후 (Temperature Regulation) ─────────────────
 
 # 월지에 따른 사주 온도 경향
@@ -295,6 +343,19 @@ NAYIN = {
     "壬戌": "大海水", "癸亥": "大海水",
 }
 
+# 60갑자별 Pillar 파생 속성 (import 시 한 번만 계산)
+# ganzi -> (stem_ko, branch_ko, stem_element, branch_element,
+#           stem_polarity, branch_polarity, hidden_stems, nayin)
+PILLAR_ATTRS = {
+    gz: (
+        STEM_KO[gz[0]], BRANCH_KO[gz[1]],
+        STEM_ELEMENT[gz[0]], BRANCH_ELEMENT[gz[1]],
+        STEM_POLARITY[gz[0]], BRANCH_POLARITY[gz[1]],
+        HIDDEN_STEMS[gz[1]], NAYIN[gz],
+    )
+    for gz in SIXTY_JIAZI
+}
+
 # ──────────────────────────── 유틸리티 함수 ─────────────────────────────────
 
 def get_element(char: str) -> str:
@@ -330,8 +391,8 @@ def get_relation(self_element: str, other_element: str) -> str:
     raise ValueError(f"No relation found: {self_element} -> {other_element}")
 
 
-def get_ten_god(day_stem: str, other: str) -> str:
-    """일간 기준으로 다른 천간/지지의 십성을 반환"""
+def _compute_ten_god(day_stem: str, other: str) -> str:
+    """일간 기준 십성을 오행/음양 관계로부터 직접 계산"""
     day_element = get_element(day_stem)
     other_element = get_element(other)
     day_pol = get_polarity(day_stem)
@@ -341,3 +402,51 @@ def get_ten_god(day_stem: str, other: str) -> str:
     same_polarity = (day_pol == other_pol)
     pair = TEN_GOD_TABLE[relation]
     return pair[0] if same_polarity else pair[1]
+
+
+# 일간 → {천간/지지 → 십성} (10 x 22, import 시 한 번만 계산)
+TEN_GOD_LOOKUP = {
+    day_stem: {
+        other: _compute_ten_god(day_stem, other)
+        for other in HEAVENLY_STEMS + EARTHLY_BRANCHES
+    }
+    for day_stem in HEAVENLY_STEMS
+}
+
+
+def get_ten_god(day_stem: str, other: str) -> str:
+    """일간 기준으로 다른 천간/지지의 십성을 반환"""
+    try:
+        return TEN_GOD_LOOKUP[day_stem][other]
+    except KeyError:
+        # 알 수 없는 글자 - 직접 계산 경로에서 ValueError 발생
+        return _compute_ten_god(day_stem, other)
+
+
+# ──────────────────────────── 읽기 전용 동결 (Read-only Tables) ─────────────
+# 파생 테이블 계산이 모두 끝난 뒤, 조합/구조 테이블을 읽기 전용 뷰로 교체합니다.
+# 8자마다 조회되는 글자 속성 테이블(STEM_*, BRANCH_KO/ELEMENT/POLARITY, ELEMENT_*,
+# TEN_GOD_LOOKUP/CATEGORY, PILLAR_ATTRS 등)은 조회 속도를 위해 일반 dict로 두며,
+# 마찬가지로 수정하지 않는 것을 전제로 합니다.
+
+BRANCH_SEASON = MappingProxyType(BRANCH_SEASON)
+HIDDEN_STEMS = MappingProxyType(HIDDEN_STEMS)
+BRANCH_HIDDEN_NORMALIZED = MappingProxyType(BRANCH_HIDDEN_NORMALIZED)
+
+TEN_GOD_TABLE = MappingProxyType(TEN_GOD_TABLE)
+TEN_GOD_KO_TO_EN = MappingProxyType(TEN_GOD_KO_TO_EN)
+
+STEM_COMBINATIONS = MappingProxyType(STEM_COMBINATIONS)
+BRANCH_SIX_COMBINATIONS = MappingProxyType(BRANCH_SIX_COMBINATIONS)
+BRANCH_THREE_HARMONY = MappingProxyType(BRANCH_THREE_HARMONY)
+BRANCH_DIRECTIONAL = MappingProxyType(BRANCH_DIRECTIONAL)
+BRANCH_CLASHES = frozenset(BRANCH_CLASHES)
+BRANCH_PUNISHMENTS = MappingProxyType(BRANCH_PUNISHMENTS)
+BRANCH_BREAKS = frozenset(BRANCH_BREAKS)
+
+YEAR_STEM_TO_MONTH_STEM_START = MappingProxyType(YEAR_STEM_TO_MONTH_STEM_START)
+DAY_STEM_TO_HOUR_STEM_START = MappingProxyType(DAY_STEM_TO_HOUR_STEM_START)
+POSITION_WEIGHTS = MappingProxyType(POSITION_WEIGHTS)
+MONTH_TEMPERATURE = MappingProxyType(MONTH_TEMPERATURE)
+JOHU_YONGSHIN = MappingProxyType(JOHU_YONGSHIN)
+NAYIN = MappingProxyType(NAYIN)
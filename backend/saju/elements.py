@@ -3,97 +3,114 @@ Phase 2-3: 오행 분포 분석 (Five Elements Analysis)
 일간을 중심으로 사주 전체의 오행 에너지 분포를 가중치 기반으로 분석
 """
 
+from functools import lru_cache
+
 from .calculator import FourPillars
 from .constants import (
-    STEM_ELEMENT, BRANCH_ELEMENT, HIDDEN_STEMS,
-    POSITION_WEIGHTS, ELEMENTS, ELEMENT_KO, ELEMENT_EN,
+    EARTHLY_BRANCHES, BRANCH_HIDDEN_NORMALIZED,
+    STEM_ELEMENT_IDX, BRANCH_ELEMENT_IDX,
+    POSITIONS, POSITION_WEIGHTS_VEC, ELEMENTS, ELEMENT_KO, ELEMENT_EN,
 )
 
+# ─────── import 시 한 번만 계산하는 조회 테이블 ───────
 
-def analyze_elements(pillars: FourPillars) -> dict:
-    """
-    사주의 오행 분포를 가중치 기반으로 분석합니다.
+# 지지 인덱스 → ((지장간 오행 인덱스, 비율), ...) - 0인 오행은 제외
+_BRANCH_HIDDEN_RATIOS = tuple(
+    tuple((i, r) for i, r in enumerate(BRANCH_HIDDEN_NORMALIZED[branch]) if r)
+    for branch in EARTHLY_BRANCHES
+)
 
-    가중치 기준 (data/2번 파일 참조):
-    - 월지(월령): 35점 (계절 주관, 가장 중요)
-    - 일지: 18점 (본인의 뿌리)
-    - 천간: 각 10점
-    - 나머지 지지: 각 10점
-    - 지장간: 비례 배분
+# 오행별 고정 메타데이터 (ELEMENTS 순서): (한자, 한글, 영문)
+_ELEMENT_META = tuple((e, ELEMENT_KO[e], ELEMENT_EN[e]) for e in ELEMENTS)
+
+# 위치별 (가중치, 천간 여부) - POSITIONS 순서
+_POSITION_SLOTS = tuple(
+    (weight, pos.endswith("_stem"))
+    for pos, weight in zip(POSITIONS, POSITION_WEIGHTS_VEC)
+)
+
+
+@lru_cache(maxsize=4096)
+def _score_elements(indices: tuple[int, ...]) -> tuple[tuple[float, ...], tuple[int, ...]]:
+    """
+    오행 점수 계산 핵심부 (순수 수치 연산).
+    8자 인덱스(FourPillars.indices)만으로 결정되므로 결과를 메모이즈합니다.
 
     Returns:
-        오행별 점수, 개수, 비율 등을 포함한 분석 결과
+        (ELEMENTS 순서의 오행별 점수, 오행별 글자 수)
     """
-    # 오행별 점수 초기화
-    element_scores = {e: 0.0 for e in ELEMENTS}
-    element_counts = {e: 0 for e in ELEMENTS}
-
-    # 위치별 매핑
-    positions = {
-        "year_stem": pillars.year.stem,
-        "year_branch": pillars.year.branch,
-        "month_stem": pillars.month.stem,
-        "month_branch": pillars.month.branch,
-        "day_stem": pillars.day.stem,
-        "day_branch": pillars.day.branch,
-        "time_stem": pillars.time.stem,
-        "time_branch": pillars.time.branch,
-    }
+    scores = [0.0] * 5
+    counts = [0] * 5
 
     # 천간/지지 직접 점수 계산
-    for pos_key, char in positions.items():
-        weight = POSITION_WEIGHTS[pos_key]
+    for (weight, is_stem), idx in zip(_POSITION_SLOTS, indices):
         if weight == 0:
             continue
 
-        if pos_key.endswith("_stem"):
-            element = STEM_ELEMENT[char]
-            element_scores[element] += weight
-            element_counts[element] += 1
+        if is_stem:
+            elem = STEM_ELEMENT_IDX[idx]
+            scores[elem] += weight
+            counts[elem] += 1
         else:
             # 지지는 지장간으로 분배
-            branch = char
-            hidden = HIDDEN_STEMS.get(branch, [])
-            total_days = sum(d for _, d in hidden)
-            if total_days > 0:
-                for stem, days in hidden:
-                    elem = STEM_ELEMENT[stem]
-                    ratio = days / total_days
-                    element_scores[elem] += weight * ratio
+            for elem, ratio in _BRANCH_HIDDEN_RATIOS[idx]:
+                scores[elem] += weight * ratio
 
             # 지지 자체의 오행도 카운트
-            element_counts[BRANCH_ELEMENT[branch]] += 1
+            counts[BRANCH_ELEMENT_IDX[idx]] += 1
 
     # 일간(day stem) 본인의 오행 점수도 별도로 추가 (기본 점수)
-    day_element = STEM_ELEMENT[pillars.day.stem]
-    element_scores[day_element] += 5  # 일간 기본 점수
+    scores[STEM_ELEMENT_IDX[indices[4]]] += 5  # 일간 기본 점수
+
+    return tuple(scores), tuple(counts)
+
+
+def analyze_elements(pillars: FourPillars) -> dict:
+    """
+    사주의 오행 분포를 가중치 기반으로 분석합니다.
+
+    가중치 기준 (data/2번 파일 참조):
+    - 월지(월령): 35점 (계절 주관, 가장 중요)
+    - 일지: 18점 (본인의 뿌리)
+    - 천간: 각 10점
+    - 나머지 지지: 각 10점
+    - 지장간: 비례 배분
+
+    Returns:
+        오행별 점수, 개수, 비율 등을 포함한 분석 결과
+    """
+    scores, counts = _score_elements(pillars.indices)
+
+    day_element = pillars.day_element
 
     # 총점 계산
-    total_score = sum(element_scores.values())
+    total_score = sum(scores)
 
     # 비율 계산
-    element_ratios = {}
-    for e in ELEMENTS:
-        element_ratios[e] = round(element_scores[e] / total_score * 100, 1) if total_score > 0 else 0
+    ratios = [
+        round(sc / total_score * 100, 1) if total_score > 0 else 0
+        for sc in scores
+    ]
 
     # 결과 구성
-    stats = {}
-    for e in ELEMENTS:
-        stats[e] = {
+    stats = {
+        e: {
             "element": e,
-            "element_ko": ELEMENT_KO[e],
-            "element_en": ELEMENT_EN[e],
-            "count": element_counts[e],
-            "score": round(element_scores[e], 1),
-            "ratio": element_ratios[e],
+            "element_ko": ko,
+            "element_en": en,
+            "count": count,
+            "score": round(score, 1),
+            "ratio": ratio,
         }
+        for (e, ko, en), count, score, ratio in zip(_ELEMENT_META, counts, scores, ratios)
+    }
 
     # 최강/최약 오행
-    strongest = max(ELEMENTS, key=lambda e: element_scores[e])
-    weakest = min(ELEMENTS, key=lambda e: element_scores[e])
+    strongest = ELEMENTS[max(range(5), key=scores.__getitem__)]
+    weakest = ELEMENTS[min(range(5), key=scores.__getitem__)]
 
     # 부족한 오행 (5% 미만)
-    missing = [e for e in ELEMENTS if element_ratios[e] < 5]
+    missing = [e for e, ratio in zip(ELEMENTS, ratios) if ratio < 5]
 
     return {
         "element_stats": stats,
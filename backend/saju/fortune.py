@@ -4,12 +4,51 @@ Phase 8: 대운(大運) 및 세운(歲運) 계산
 """
 
 from datetime import datetime
+from functools import lru_cache
+
 from .calculator import FourPillars, get_yun_data
 from .constants import (
-    STEM_ELEMENT, BRANCH_ELEMENT, ELEMENT_KO,
-    ELEMENT_GENERATES, ELEMENT_CONTROLS,
-    HEAVENLY_STEMS, EARTHLY_BRANCHES,
-    STEM_KO, BRANCH_KO,
+    ELEMENT_KO, ELEMENT_GENERATES, ELEMENT_GENERATED_BY, ELEMENT_CONTROLS,
+    ELEMENTS, SIXTY_JIAZI, PILLAR_ATTRS,
+)
+
+
+# ─────── import 시 한 번만 계산하는 점수 테이블 ───────
+
+def _element_delta(elem: str, yong_shin: str, gi_shin: str) -> int:
+    """오행 하나가 대운/세운 점수에 더하는 가감점 (용신/기신 기준)"""
+    delta = 0
+
+    # 용신 관련
+    if elem == yong_shin:
+        delta += 25
+    elif elem == ELEMENT_GENERATED_BY.get(yong_shin):  # 용신을 생하는 오행
+        delta += 15
+    elif elem == ELEMENT_GENERATES.get(yong_shin):     # 용신이 생하는 오행
+        delta += 5
+
+    # 기신 관련
+    if elem == gi_shin:
+        delta -= 20
+    elif elem == ELEMENT_GENERATED_BY.get(gi_shin):    # 기신을 생하는 오행
+        delta -= 10
+
+    return delta
+
+
+# (용신, 기신) → {오행 → 가감점}, 5 x 5 조합
+_FORTUNE_DELTAS = {
+    (yong, gi): {e: _element_delta(e, yong, gi) for e in ELEMENTS}
+    for yong in ELEMENTS
+    for gi in ELEMENTS
+}
+
+# 60갑자 순번 → 세운 고정 필드 (천간, 지지, 간지, 한글 간지, 천간 오행, 지지 오행)
+# 연도의 간지는 (연도 - 4) % 60 번째 갑자로 결정됩니다.
+_YEAR_GANZI = tuple(
+    (gz[0], gz[1], gz, attrs[0] + attrs[1], attrs[2], attrs[3])
+    for gz in SIXTY_JIAZI
+    for attrs in (PILLAR_ATTRS[gz],)
 )
 
 
@@ -42,6 +81,9 @@ def analyze_fortune(
     yong_shin = yong_shin_result["yong_shin"]
     gi_shin = yong_shin_result.get("gi_shin", "")
 
+    # 이번 요청의 용신/기신 기준 오행별 가감점 (대운/세운 점수에 공통 사용)
+    deltas = _fortune_deltas(yong_shin, gi_shin)
+
     # 대운 데이터 가져오기
     yun_data = get_yun_data(
         birth_year, birth_month, birth_day, birth_hour, birth_minute, gender,
@@ -57,7 +99,7 @@ def analyze_fortune(
     current_da_yun = None
 
     for dy in yun_data["da_yun"]:
-        score = _score_fortune(dy["stem"], dy["branch"], yong_shin, gi_shin, pillars)
+        score = _score_fortune(deltas, dy["stem_element"], dy["branch_element"])
         dy_scored = {**dy, "score": score, "rating": _score_to_rating(score)}
 
         scored_da_yun.append(dy_scored)
@@ -65,17 +107,10 @@ def analyze_fortune(
         if dy["start_age"] <= current_age <= dy["end_age"]:
             current_da_yun = dy_scored
 
-    # 현재 세운 (올해)
+    # 올해부터 향후 5년 세운 (첫 항목이 올해 세운)
     current_year = now.year
-    current_year_fortune = _calculate_yearly_fortune(
-        current_year, yong_shin, gi_shin, pillars
-    )
-
-    # 향후 5년 세운
-    yearly_fortunes = []
-    for y in range(current_year, current_year + 6):
-        yf = _calculate_yearly_fortune(y, yong_shin, gi_shin, pillars)
-        yearly_fortunes.append(yf)
+    yearly_fortunes = _calculate_yearly_fortunes(current_year, 6, yong_shin, deltas)
+    current_year_fortune = yearly_fortunes[0]
 
     return {
         "yun_info": {
@@ -91,81 +126,62 @@ def analyze_fortune(
     }
 
 
-def _calculate_yearly_fortune(
-    year: int,
+def _calculate_yearly_fortunes(
+    start_year: int,
+    count: int,
     yong_shin: str,
-    gi_shin: str,
-    pillars: FourPillars,
-) -> dict:
-    """특정 연도의 세운을 계산합니다."""
-    # 연도의 천간지지 계산 (60갑자 순환)
-    stem_idx = (year - 4) % 10
-    branch_idx = (year - 4) % 12
-    stem = HEAVENLY_STEMS[stem_idx]
-    branch = EARTHLY_BRANCHES[branch_idx]
-
-    score = _score_fortune(stem, branch, yong_shin, gi_shin, pillars)
-
-    return {
-        "year": year,
-        "stem": stem,
-        "branch": branch,
-        "ganzi": stem + branch,
-        "ganzi_ko": STEM_KO.get(stem, "") + BRANCH_KO.get(branch, ""),
-        "stem_element": STEM_ELEMENT[stem],
-        "branch_element": BRANCH_ELEMENT[branch],
-        "score": score,
-        "rating": _score_to_rating(score),
-        "summary": _get_fortune_summary(score, stem, branch, yong_shin),
-    }
-
-
-def _score_fortune(
-    stem: str,
-    branch: str,
-    yong_shin: str,
-    gi_shin: str,
-    pillars: FourPillars,
-) -> int:
+    deltas: dict,
+) -> list[dict]:
+    """start_year부터 count년 동안의 세운을 계산합니다."""
+    yong_ko = ELEMENT_KO.get(yong_shin, "")
+    fortunes = []
+    for year in range(start_year, start_year + count):
+        # 연도의 천간지지 (60갑자 순환)
+        stem, branch, ganzi, ganzi_ko, stem_elem, branch_elem = _YEAR_GANZI[(year - 4) % 60]
+        score = _score_fortune(deltas, stem_elem, branch_elem)
+        fortunes.append({
+            "year": year,
+            "stem": stem,
+            "branch": branch,
+            "ganzi": ganzi,
+            "ganzi_ko": ganzi_ko,
+            "stem_element": stem_elem,
+            "branch_element": branch_elem,
+            "score": score,
+            "rating": _score_to_rating(score),
+            "summary": _get_fortune_summary(score, ganzi_ko, yong_ko),
+        })
+    return fortunes
+
+
+def _fortune_deltas(yong_shin: str, gi_shin: str) -> dict:
+    """용신/기신 기준 오행별 가감점 테이블을 반환합니다."""
+    deltas = _FORTUNE_DELTAS.get((yong_shin, gi_shin))
+    if deltas is None:
+        # 오행이 아닌 용신/기신 값 (예: 빈 기신) - 직접 계산
+        deltas = {e: _element_delta(e, yong_shin, gi_shin) for e in ELEMENTS}
+    return deltas
+
+
+def _score_fortune(deltas: dict, stem_element: str, branch_element: str) -> int:
     """
-    대운/세운의 간지를 용신과 비교하여 점수를 매깁니다.
+    대운/세운의 간지 오행을 용신과 비교하여 점수를 매깁니다.
+    deltas는 _fortune_deltas()로 요청당 한 번 만든 오행별 가감점입니다.
 
-    점수 기준:
-    - 용신과 같은 오행: +30
-    - 용신을 생하는 오행: +20
-    - 용신과 합: +15
+    점수 기준 (기본 50점, 천간/지지 오행에 각각 적용 후 0~100으로 제한):
+    - 용신과 같은 오행: +25
+    - 용신을 생하는 오행: +15
+    - 용신이 생하는 오행: +5
     - 기신과 같은 오행: -20
     - 기신을 생하는 오행: -10
-    - 원국과 충: -15 (변동성)
     """
-    score = 50  # 기본 점수
-
-    stem_elem = STEM_ELEMENT.get(stem, "")
-    branch_elem = BRANCH_ELEMENT.get(branch, "")
-
-    for elem in [stem_elem, branch_elem]:
-        if not elem:
-            continue
-
-        # 용신 관련
-        if elem == yong_shin:
-            score += 25
-        elif ELEMENT_GENERATES.get(elem) == yong_shin:
-            score += 15
-        elif ELEMENT_GENERATES.get(yong_shin) == elem:
-            score += 5
-
-        # 기신 관련
-        if elem == gi_shin:
-            score -= 20
-        elif ELEMENT_GENERATES.get(elem) == gi_shin:
-            score -= 10
+    score = 50 + deltas.get(stem_element, 0) + deltas.get(branch_element, 0)
 
     # 점수 범위 제한
-    score = max(0, min(100, score))
-    return score
+    return max(0, min(100, score))
 
 
+@lru_cache(maxsize=128)
 def _score_to_rating(score: int) -> str:
     """점수를 등급으로 변환"""
     if score >= 85:
@@ -180,19 +196,21 @@ def _score_to_rating(score: int) -> str:
         return "대흉(大凶)"
 
 
-def _get_fortune_summary(score: int, stem: str, branch: str, yong_shin: str) -> str:
-    """운세 요약 생성"""
-    stem_elem = STEM_ELEMENT.get(stem, "")
-    branch_elem = BRANCH_ELEMENT.get(branch, "")
-    ganzi_ko = STEM_KO.get(stem, "") + BRANCH_KO.get(branch, "")
+# 세운 요약 문구: (최소 점수, 템플릿) - 점수가 높은 구간부터 검사
+_FORTUNE_SUMMARY_TEMPLATES = (
+    (85, "{ganzi_ko}년은 용신 {yong_ko}의 기운이 강하게 작용하여 매사 순조롭고 크게 발전하는 해입니다."),
+    (70, "{ganzi_ko}년은 전반적으로 좋은 기운이 흐르며, 노력한 만큼 성과를 얻을 수 있는 해입니다."),
+    (55, "{ganzi_ko}년은 큰 변동 없이 안정적인 해입니다. 꾸준한 노력이 중요합니다."),
+    (40, "{ganzi_ko}년은 다소 어려움이 예상되는 해입니다. 신중한 판단과 인내가 필요합니다."),
+)
+_FORTUNE_SUMMARY_DEFAULT = "{ganzi_ko}년은 시련이 예상되는 해입니다. 큰 결정은 피하고 내실을 다지는 것이 좋습니다."
 
-    if score >= 85:
-        return f"{ganzi_ko}년은 용신 {ELEMENT_KO.get(yong_shin, '')}의 기운이 강하게 작용하여 매사 순조롭고 크게 발전하는 해입니다."
-    elif score >= 70:
-        return f"{ganzi_ko}년은 전반적으로 좋은 기운이 흐르며, 노력한 만큼 성과를 얻을 수 있는 해입니다."
-    elif score >= 55:
-        return f"{ganzi_ko}년은 큰 변동 없이 안정적인 해입니다. 꾸준한 노력이 중요합니다."
-    elif score >= 40:
-        return f"{ganzi_ko}년은 다소 어려움이 예상되는 해입니다. 신중한 판단과 인내가 필요합니다."
-    else:
-        return f"{ganzi_ko}년은 시련이 예상되는 해입니다. 큰 결정은 피하고 내실을 다지는 것이 좋습니다."
+
+def _get_fortune_summary(score: int, ganzi_ko: str, yong_ko: str) -> str:
+    """운세 요약 생성"""
+    template = _FORTUNE_SUMMARY_DEFAULT
+    for threshold, candidate in _FORTUNE_SUMMARY_TEMPLATES:
+        if score >= threshold:
+            template = candidate
+            break
+    return template.format(ganzi_ko=ganzi_ko, yong_ko=yong_ko)
@@ -5,236 +5,302 @@ Phase 6: 합(合), 충(沖), 형(刑), 파(破) 분석
 처리 우선순위: 방합 > 삼합 > 육합 > 충 > 형/파/해
 """
 
+from collections import Counter
+from functools import lru_cache
+from itertools import combinations
+from operator import itemgetter
+
 from .calculator import FourPillars
 from .constants import (
     STEM_COMBINATIONS, BRANCH_SIX_COMBINATIONS,
     BRANCH_THREE_HARMONY, BRANCH_DIRECTIONAL,
     BRANCH_CLASHES, BRANCH_PUNISHMENTS, BRANCH_BREAKS,
-    STEM_KO, BRANCH_KO, ELEMENT_KO,
+    STEM_KO, BRANCH_KO, ELEMENT_KO, pair_key,
+    HEAVENLY_STEMS, EARTHLY_BRANCHES,
+)
+
+# ─────── import 시 한 번만 계산하는 관계 행렬 (정수 인덱스 기반) ───────
+
+# 천간 인덱스 쌍 → 천간합 결과 오행 (없으면 None), 10 x 10
+_STEM_COMBO_MATRIX = tuple(
+    tuple(STEM_COMBINATIONS.get(pair_key(a, b)) for b in HEAVENLY_STEMS)
+    for a in HEAVENLY_STEMS
+)
+
+# 지지 인덱스 쌍 → 육합 결과 오행 (없으면 None) / 충 여부 / 파 여부, 12 x 12
+_SIX_COMBO_MATRIX = tuple(
+    tuple(BRANCH_SIX_COMBINATIONS.get(pair_key(a, b)) for b in EARTHLY_BRANCHES)
+    for a in EARTHLY_BRANCHES
+)
+_CLASH_MATRIX = tuple(
+    tuple(pair_key(a, b) in BRANCH_CLASHES for b in EARTHLY_BRANCHES)
+    for a in EARTHLY_BRANCHES
+)
+_BREAK_MATRIX = tuple(
+    tuple(pair_key(a, b) in BRANCH_BREAKS for b in EARTHLY_BRANCHES)
+    for a in EARTHLY_BRANCHES
 )
 
+# 4주 중 두 위치의 조합 C(4, 2): (0, 1), (0, 2), ..., (2, 3)
+_PAIRS = tuple(combinations(range(4), 2))
+
+# has_harmony 판정에 쓰는 합(合) 유형
+_HARMONY_TYPES = ("방합", "삼합", "육합", "천간합")
+
 
 def analyze_interactions(pillars: FourPillars) -> dict:
     """
     사주 내 천간/지지의 합충형파 관계를 분석합니다.
 
+    결과는 8자 인덱스만으로 결정되므로 캐시된 dict를 그대로 반환합니다.
+    호출 측에서 수정하지 않아야 합니다 (읽기 전용).
+
     Returns:
         발견된 모든 상호작용 목록과 해석
     """
+    return _analyze_interactions_cached(pillars.indices)
+
+
+@lru_cache(maxsize=4096)
+def _analyze_interactions_cached(indices: tuple[int, ...]) -> dict:
+    """8자 인덱스(FourPillars.indices)를 키로 합충형파 분석 결과를 메모이즈합니다."""
     interactions = []
 
+    # 8자 인덱스 (짝수: 천간, 홀수: 지지)
+    stem_idx = indices[0::2]
+    branch_idx = indices[1::2]
+
     stems = [
-        ("연간", pillars.year.stem),
-        ("월간", pillars.month.stem),
-        ("일간", pillars.day.stem),
-        ("시간", pillars.time.stem),
+        ("연간", HEAVENLY_STEMS[stem_idx[0]]),
+        ("월간", HEAVENLY_STEMS[stem_idx[1]]),
+        ("일간", HEAVENLY_STEMS[stem_idx[2]]),
+        ("시간", HEAVENLY_STEMS[stem_idx[3]]),
     ]
 
     branches = [
-        ("연지", pillars.year.branch),
-        ("월지", pillars.month.branch),
-        ("일지", pillars.day.branch),
-        ("시지", pillars.time.branch),
+        ("연지", EARTHLY_BRANCHES[branch_idx[0]]),
+        ("월지", EARTHLY_BRANCHES[branch_idx[1]]),
+        ("일지", EARTHLY_BRANCHES[branch_idx[2]]),
+        ("시지", EARTHLY_BRANCHES[branch_idx[3]]),
     ]
 
     # ─────── 1. 천간합 분석 ───────
-    for i in range(len(stems)):
-        for j in range(i + 1, len(stems)):
-            pair = frozenset([stems[i][1], stems[j][1]])
-            if pair in STEM_COMBINATIONS:
-                result_element = STEM_COMBINATIONS[pair]
-                interactions.append({
-                    "type": "천간합",
-                    "priority": 3,
-                    "elements": [stems[i][1], stems[j][1]],
-                    "elements_ko": [STEM_KO[stems[i][1]], STEM_KO[stems[j][1]]],
-                    "positions": [stems[i][0], stems[j][0]],
-                    "result": result_element,
-                    "result_ko": ELEMENT_KO.get(result_element, ""),
-                    "impact": "medium",
-                    "description": (
-                        f"{stems[i][0]} {STEM_KO[stems[i][1]]}과(와) "
-                        f"{stems[j][0]} {STEM_KO[stems[j][1]]}이(가) "
-                        f"합하여 {ELEMENT_KO.get(result_element, '')}({result_element})의 기운을 생성합니다."
-                    ),
-                })
+    for i, j in _PAIRS:
+        result_element = _STEM_COMBO_MATRIX[stem_idx[i]][stem_idx[j]]
+        if result_element:
+            a_pos, a = stems[i]
+            b_pos, b = stems[j]
+            a_ko, b_ko = STEM_KO[a], STEM_KO[b]
+            result_ko = ELEMENT_KO.get(result_element, "")
+            interactions.append({
+                "type": "천간합",
+                "priority": 3,
+                "elements": [a, b],
+                "elements_ko": [a_ko, b_ko],
+                "positions": [a_pos, b_pos],
+                "result": result_element,
+                "result_ko": result_ko,
+                "impact": "medium",
+                "description": (
+                    f"{a_pos} {a_ko}과(와) "
+                    f"{b_pos} {b_ko}이(가) "
+                    f"합하여 {result_ko}({result_element})의 기운을 생성합니다."
+                ),
+            })
 
     branch_list = [b[1] for b in branches]
     branch_set = set(branch_list)
 
+    # 지지 → 위치 (같은 지지가 여러 번이면 첫 위치)
+    branch_pos = {}
+    for pos, b in branches:
+        branch_pos.setdefault(b, pos)
+
     # ─────── 2. 방합 분석 (최우선) ───────
     for combo, result_element in BRANCH_DIRECTIONAL.items():
-        if combo.issubset(branch_set):
+        if all(m in branch_set for m in combo):
             members = list(combo)
-            pos_list = [branches[branch_list.index(m)][0] for m in members if m in branch_list]
+            members_ko = [BRANCH_KO[m] for m in members]
+            result_ko = ELEMENT_KO.get(result_element, "")
+            pos_list = [branch_pos[m] for m in members]
             interactions.append({
                 "type": "방합",
                 "priority": 1,
                 "elements": members,
-                "elements_ko": [BRANCH_KO[m] for m in members],
+                "elements_ko": members_ko,
                 "positions": pos_list,
                 "result": result_element,
-                "result_ko": ELEMENT_KO.get(result_element, ""),
+                "result_ko": result_ko,
                 "impact": "very_high",
                 "description": (
-                    f"{', '.join(BRANCH_KO[m] for m in members)}이(가) "
-                    f"방합하여 강력한 {ELEMENT_KO.get(result_element, '')}({result_element})국을 형성합니다."
+                    f"{', '.join(members_ko)}이(가) "
+                    f"방합하여 강력한 {result_ko}({result_element})국을 형성합니다."
                 ),
             })
 
     # ─────── 3. 삼합 분석 ───────
+    # 구성원은 조합 튜플의 전통 순서를 그대로 따르므로 (집합 순회 없음)
+    # 결과 순서가 실행마다 달라지지 않습니다. 삼형도 동일합니다.
     for combo, result_element in BRANCH_THREE_HARMONY.items():
-        matching = combo.intersection(branch_set)
+        matching = [m for m in combo if m in branch_set]
         if len(matching) >= 2:
-            members = list(matching)
-            pos_list = [branches[branch_list.index(m)][0] for m in members if m in branch_list]
+            members = matching
+            members_ko = [BRANCH_KO[m] for m in members]
+            result_ko = ELEMENT_KO.get(result_element, "")
+            pos_list = [branch_pos[m] for m in members]
             is_full = len(matching) == 3
 
             interactions.append({
                 "type": "삼합" if is_full else "반삼합",
                 "priority": 2 if is_full else 2.5,
                 "elements": members,
-                "elements_ko": [BRANCH_KO[m] for m in members],
+                "elements_ko": members_ko,
                 "positions": pos_list,
                 "result": result_element,
-                "result_ko": ELEMENT_KO.get(result_element, ""),
+                "result_ko": result_ko,
                 "impact": "high" if is_full else "medium",
                 "description": (
-                    f"{', '.join(BRANCH_KO[m] for m in members)}이(가) "
+                    f"{', '.join(members_ko)}이(가) "
                     f"{'삼합' if is_full else '반삼합'}하여 "
-                    f"{ELEMENT_KO.get(result_element, '')}({result_element})국을 {'형성' if is_full else '지향'}합니다."
+                    f"{result_ko}({result_element})국을 {'형성' if is_full else '지향'}합니다."
                 ),
             })
 
-    # ─────── 4. 육합 분석 ───────
-    for i in range(len(branches)):
-        for j in range(i + 1, len(branches)):
-            pair = frozenset([branches[i][1], branches[j][1]])
-            if pair in BRANCH_SIX_COMBINATIONS:
-                result_element = BRANCH_SIX_COMBINATIONS[pair]
-                interactions.append({
-                    "type": "육합",
-                    "priority": 3,
-                    "elements": [branches[i][1], branches[j][1]],
-                    "elements_ko": [BRANCH_KO[branches[i][1]], BRANCH_KO[branches[j][1]]],
-                    "positions": [branches[i][0], branches[j][0]],
-                    "result": result_element,
-                    "result_ko": ELEMENT_KO.get(result_element, ""),
-                    "impact": "medium",
-                    "description": (
-                        f"{branches[i][0]} {BRANCH_KO[branches[i][1]]}과(와) "
-                        f"{branches[j][0]} {BRANCH_KO[branches[j][1]]}이(가) "
-                        f"육합하여 {ELEMENT_KO.get(result_element, '')}({result_element})의 기운을 생성합니다."
-                    ),
-                })
+    # ─────── 4. 육합 · 지충 · 파(破) 분석 (지지 쌍 단일 순회) ───────
+    # 유형별 우선순위가 달라 정렬 후 순서는 유형별 개별 순회와 동일합니다.
+    for i, j in _PAIRS:
+        bi, bj = branch_idx[i], branch_idx[j]
+        result_element = _SIX_COMBO_MATRIX[bi][bj]
+        is_clash = _CLASH_MATRIX[bi][bj]
+        is_break = _BREAK_MATRIX[bi][bj]
+        if not (result_element or is_clash or is_break):
+            continue
 
-    # ─────── 5. 지충 분석 ───────
-    for i in range(len(branches)):
-        for j in range(i + 1, len(branches)):
-            pair = frozenset([branches[i][1], branches[j][1]])
-            if pair in BRANCH_CLASHES:
-                interactions.append({
-                    "type": "충",
-                    "priority": 4,
-                    "elements": [branches[i][1], branches[j][1]],
-                    "elements_ko": [BRANCH_KO[branches[i][1]], BRANCH_KO[branches[j][1]]],
-                    "positions": [branches[i][0], branches[j][0]],
-                    "result": "",
-                    "impact": "high",
-                    "description": (
-                        f"{branches[i][0]} {BRANCH_KO[branches[i][1]]}과(와) "
-                        f"{branches[j][0]} {BRANCH_KO[branches[j][1]]}이(가) "
-                        f"충하여 변화와 이동의 에너지가 있습니다."
-                    ),
-                })
+        # 설명 문구용 글자/위치/한글 이름은 쌍마다 한 번만 조회
+        a_pos, a = branches[i]
+        b_pos, b = branches[j]
+        a_ko, b_ko = BRANCH_KO[a], BRANCH_KO[b]
+
+        if result_element:
+            result_ko = ELEMENT_KO.get(result_element, "")
+            interactions.append({
+                "type": "육합",
+                "priority": 3,
+                "elements": [a, b],
+                "elements_ko": [a_ko, b_ko],
+                "positions": [a_pos, b_pos],
+                "result": result_element,
+                "result_ko": result_ko,
+                "impact": "medium",
+                "description": (
+                    f"{a_pos} {a_ko}과(와) "
+                    f"{b_pos} {b_ko}이(가) "
+                    f"육합하여 {result_ko}({result_element})의 기운을 생성합니다."
+                ),
+            })
+
+        if is_clash:
+            interactions.append({
+                "type": "충",
+                "priority": 4,
+                "elements": [a, b],
+                "elements_ko": [a_ko, b_ko],
+                "positions": [a_pos, b_pos],
+                "result": "",
+                "impact": "high",
+                "description": (
+                    f"{a_pos} {a_ko}과(와) "
+                    f"{b_pos} {b_ko}이(가) "
+                    f"충하여 변화와 이동의 에너지가 있습니다."
+                ),
+            })
+
+        if is_break:
+            interactions.append({
+                "type": "파",
+                "priority": 6,
+                "elements": [a, b],
+                "elements_ko": [a_ko, b_ko],
+                "positions": [a_pos, b_pos],
+                "result": "",
+                "impact": "low",
+                "description": (
+                    f"{a_pos} {a_ko}과(와) "
+                    f"{b_pos} {b_ko}이(가) "
+                    f"파(破)합니다. 관계에 미세한 균열을 의미합니다."
+                ),
+            })
+
+    # ─────── 5. 형(刑) 분석 ───────
+    # 자형 판정용 지지별 개수
+    branch_counter = Counter(branch_list)
 
-    # ─────── 6. 형(刑) 분석 ───────
     # 삼형 체크
     for combo, punishment_type in BRANCH_PUNISHMENTS.items():
         members = list(combo)
         # 자형(같은 글자 2개) 체크
         if len(members) == 2 and members[0] == members[1]:
-            count = branch_list.count(members[0])
+            count = branch_counter[members[0]]
             if count >= 2:
+                member_ko = BRANCH_KO[members[0]]
                 interactions.append({
                     "type": "자형",
                     "priority": 5,
                     "elements": [members[0]],
-                    "elements_ko": [BRANCH_KO[members[0]]],
+                    "elements_ko": [member_ko],
                     "positions": [],
                     "result": "",
                     "impact": "medium",
                     "description": (
-                        f"{BRANCH_KO[members[0]]}이(가) 자형(自刑)합니다. "
+                        f"{member_ko}이(가) 자형(自刑)합니다. "
                         f"자기 자신과의 갈등이나 내면적 고뇌를 의미합니다."
                     ),
                 })
         elif len(members) == 2 and members[0] != members[1]:
             # 자묘 형
             if set(members).issubset(branch_set):
+                members_ko = [BRANCH_KO[m] for m in members]
                 interactions.append({
                     "type": "형",
                     "priority": 5,
                     "elements": members,
-                    "elements_ko": [BRANCH_KO[m] for m in members],
+                    "elements_ko": members_ko,
                     "positions": [],
                     "result": "",
                     "impact": "medium",
                     "description": (
-                        f"{BRANCH_KO[members[0]]}과(와) {BRANCH_KO[members[1]]}이(가) "
+                        f"{members_ko[0]}과(와) {members_ko[1]}이(가) "
                         f"{punishment_type}으로 형(刑)합니다."
                     ),
                 })
         elif len(members) == 3:
-            matching = set(members).intersection(branch_set)
+            matching = [m for m in members if m in branch_set]
             if len(matching) >= 2:
+                matching_ko = [BRANCH_KO[m] for m in matching]
                 interactions.append({
                     "type": "삼형",
                     "priority": 5,
-                    "elements": list(matching),
-                    "elements_ko": [BRANCH_KO[m] for m in matching],
+                    "elements": matching,
+                    "elements_ko": matching_ko,
                     "positions": [],
                     "result": "",
                     "impact": "high" if len(matching) == 3 else "medium",
                     "description": (
-                        f"{', '.join(BRANCH_KO[m] for m in matching)}이(가) "
+                        f"{', '.join(matching_ko)}이(가) "
                         f"{punishment_type}으로 형(刑)합니다."
                     ),
                 })
 
-    # ─────── 7. 파(破) 분석 ───────
-    for i in range(len(branches)):
-        for j in range(i + 1, len(branches)):
-            pair = frozenset([branches[i][1], branches[j][1]])
-            if pair in BRANCH_BREAKS:
-                interactions.append({
-                    "type": "파",
-                    "priority": 6,
-                    "elements": [branches[i][1], branches[j][1]],
-                    "elements_ko": [BRANCH_KO[branches[i][1]], BRANCH_KO[branches[j][1]]],
-                    "positions": [branches[i][0], branches[j][0]],
-                    "result": "",
-                    "impact": "low",
-                    "description": (
-                        f"{branches[i][0]} {BRANCH_KO[branches[i][1]]}과(와) "
-                        f"{branches[j][0]} {BRANCH_KO[branches[j][1]]}이(가) "
-                        f"파(破)합니다. 관계에 미세한 균열을 의미합니다."
-                    ),
-                })
-
     # 우선순위 정렬
-    interactions.sort(key=lambda x: x["priority"])
+    interactions.sort(key=itemgetter("priority"))
 
-    # 요약
-    type_counts = {}
-    for inter in interactions:
-        t = inter["type"]
-        type_counts[t] = type_counts.get(t, 0) + 1
+    # 요약 (유형별 개수를 한 번에 세고, 플래그는 개수 dict로 판정)
+    type_counts = dict(Counter([inter["type"] for inter in interactions]))
 
     return {
         "interactions": interactions,
         "type_counts": type_counts,
         "total_count": len(interactions),
-        "has_major_clash": any(i["type"] == "충" for i in interactions),
-        "has_harmony": any(i["type"] in ("방합", "삼합", "육합", "천간합") for i in interactions),
+        "has_major_clash": "충" in type_counts,
+        "has_harmony": any(t in type_counts for t in _HARMONY_TYPES),
     }
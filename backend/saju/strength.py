@@ -10,22 +10,18 @@ Phase 4: 신강/신약 판단 (Strength Analysis)
 
 from .calculator import FourPillars
 from .constants import (
-    STEM_ELEMENT, BRANCH_ELEMENT, HIDDEN_STEMS,
-    ELEMENT_GENERATES, TEN_GOD_CATEGORY,
+    CHAR_ELEMENT, ELEMENTS,
+    HIDDEN_STEM_IDX, STEM_ELEMENT_IDX,
+    ELEMENT_GENERATED_BY, TEN_GOD_CATEGORY,
     get_ten_god,
 )
 
 
-def _is_supporting_element(day_element: str, other_element: str) -> bool:
-    """
-    해당 오행이 일간을 돕는 오행인지 판단합니다.
-    비겁(같은 오행) 또는 인성(일간을 생하는 오행)이면 True
-    """
-    if day_element == other_element:
-        return True  # 비겁
-    if ELEMENT_GENERATES[other_element] == day_element:
-        return True  # 인성 (나를 생함)
-    return False
+# 일간 오행 → 일간을 돕는 오행 집합
+# 비겁(같은 오행) + 인성(일간을 생하는 오행)
+_SUPPORT_SET = {
+    elem: frozenset((elem, ELEMENT_GENERATED_BY[elem])) for elem in ELEMENTS
+}
 
 
 def analyze_strength(pillars: FourPillars, element_analysis: dict) -> dict:
@@ -39,29 +35,23 @@ def analyze_strength(pillars: FourPillars, element_analysis: dict) -> dict:
     Returns:
         신강/신약 판단 결과
     """
-    day_stem = pillars.day.stem
-    day_element = STEM_ELEMENT[day_stem]
+    day_element = pillars.day_element
 
-    # ─────── 1. 득령(得令) 판단 ───────
-    month_branch = pillars.month.branch
-    month_element = BRANCH_ELEMENT[month_branch]
-    month_hidden = HIDDEN_STEMS.get(month_branch, [])
+    # 8자 인덱스 (연간, 연지, 월간, 월지, 일간, 일지, 시간, 시지)
+    indices = pillars.indices
+    day_element_idx = STEM_ELEMENT_IDX[indices[4]]
+    support = _SUPPORT_SET[day_element]
 
+    # ─────── 1. 득령(得令) 판단 ───────
     # 월지 본기(가장 큰 비중)가 일간을 돕는가
-    is_deuk_ryeong = False
-    if month_hidden:
-        main_hidden_element = STEM_ELEMENT[month_hidden[0][0]]
-        is_deuk_ryeong = _is_supporting_element(day_element, main_hidden_element)
+    main_hidden_element = ELEMENTS[STEM_ELEMENT_IDX[HIDDEN_STEM_IDX[indices[3]][0]]]
+    is_deuk_ryeong = main_hidden_element in support
 
     # ─────── 2. 득지(得地) 판단 ───────
-    day_branch = pillars.day.branch
-    day_hidden = HIDDEN_STEMS.get(day_branch, [])
-
-    is_deuk_ji = False
-    for stem, _ in day_hidden:
-        if STEM_ELEMENT[stem] == day_element:
-            is_deuk_ji = True
-            break
+    # 일지 지장간 중 일간과 같은 오행이 있는가 (통근)
+    is_deuk_ji = any(
+        STEM_ELEMENT_IDX[s] == day_element_idx for s in HIDDEN_STEM_IDX[indices[5]]
+    )
 
     # ─────── 3. 득세(得勢) 판단 ───────
     # 일간을 제외한 7자 중 일간을 돕는 글자의 비율
@@ -76,29 +66,20 @@ def analyze_strength(pillars: FourPillars, element_analysis: dict) -> dict:
 
     for char in all_chars:
         total_count += 1
-        if char in STEM_ELEMENT:
-            elem = STEM_ELEMENT[char]
-        else:
-            elem = BRANCH_ELEMENT[char]
-
-        if _is_supporting_element(day_element, elem):
-            support_count += 1
+        support_count += CHAR_ELEMENT[char] in support
 
     is_deuk_se = support_count > total_count / 2
 
     # ─────── 종합 점수 계산 ───────
     # 인성 + 비겁 점수 합계
     stats = element_analysis["element_stats"]
-    supporting_score = 0
     total_score = element_analysis["total_score"]
 
-    # 비겁 (같은 오행)
-    supporting_score += stats[day_element]["score"]
-
-    # 인성 (나를 생하는 오행)
-    for elem in stats:
-        if ELEMENT_GENERATES[elem] == day_element:
-            supporting_score += stats[elem]["score"]
+    # 비겁 (같은 오행) + 인성 (나를 생하는 오행)
+    supporting_score = (
+        stats[day_element]["score"]
+        + stats[ELEMENT_GENERATED_BY[day_element]]["score"]
+    )
 
     support_ratio = round(supporting_score / total_score * 100, 1) if total_score > 0 else 0
 
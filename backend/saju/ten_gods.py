@@ -5,10 +5,19 @@ Phase 5: 십성 배치 분석 (Ten Gods Analysis)
 
 from .calculator import FourPillars
 from .constants import (
-    get_ten_god, STEM_ELEMENT, HIDDEN_STEMS,
-    TEN_GOD_CATEGORY, TEN_GOD_KO_TO_EN, STEM_KO,
+    STEM_ELEMENT, HIDDEN_STEMS, HEAVENLY_STEMS, TEN_GOD_LOOKUP,
+    TEN_GOD_CATEGORY, TEN_GOD_KO_TO_EN, STEM_KO, BRANCH_KO,
 )
 
+# 일간 → {천간 → (십성, 십성 분류)} (import 시 한 번만 계산)
+_TEN_GOD_ROWS = {
+    day_stem: {
+        stem: (row[stem], TEN_GOD_CATEGORY.get(row[stem], ""))
+        for stem in HEAVENLY_STEMS
+    }
+    for day_stem, row in TEN_GOD_LOOKUP.items()
+}
+
 
 def analyze_ten_gods(pillars: FourPillars) -> dict:
     """
@@ -22,17 +31,21 @@ def analyze_ten_gods(pillars: FourPillars) -> dict:
     - 인성(印星): 일간을 생함 (편인/정인)
     - 음양 같으면 '편', 다르면 '정'
     """
-    day_stem = pillars.day.stem
+    # 4주를 한 번만 읽어 지역 변수로 사용
+    year, month, day, time = pillars.year, pillars.month, pillars.day, pillars.time
+    day_stem = day.stem
+    # 일간 기준 십성 행 (천간 → (십성, 분류))
+    row = _TEN_GOD_ROWS[day_stem]
 
     # 각 위치별 십성 계산
     ten_god_map = {}
 
     # 천간
     positions = [
-        ("year_stem", pillars.year.stem, "연간"),
-        ("month_stem", pillars.month.stem, "월간"),
-        ("day_stem", pillars.day.stem, "일간"),
-        ("time_stem", pillars.time.stem, "시간"),
+        ("year_stem", year.stem, "연간"),
+        ("month_stem", month.stem, "월간"),
+        ("day_stem", day_stem, "일간"),
+        ("time_stem", time.stem, "시간"),
     ]
 
     for key, stem, label in positions:
@@ -45,43 +58,41 @@ def analyze_ten_gods(pillars: FourPillars) -> dict:
                 "position": label,
             }
         else:
-            tg = get_ten_god(day_stem, stem)
+            tg, category = row[stem]
             ten_god_map[key] = {
                 "char": stem,
                 "char_ko": STEM_KO.get(stem, ""),
                 "ten_god": tg,
-                "category": TEN_GOD_CATEGORY.get(tg, ""),
+                "category": category,
                 "position": label,
             }
 
     # 지지
     branch_positions = [
-        ("year_branch", pillars.year.branch, "연지"),
-        ("month_branch", pillars.month.branch, "월지"),
-        ("day_branch", pillars.day.branch, "일지"),
-        ("time_branch", pillars.time.branch, "시지"),
+        ("year_branch", year.branch, "연지"),
+        ("month_branch", month.branch, "월지"),
+        ("day_branch", day.branch, "일지"),
+        ("time_branch", time.branch, "시지"),
     ]
 
-    from .constants import BRANCH_KO
-
     for key, branch, label in branch_positions:
         # 지지의 본기(주기)로 십성 결정
         hidden = HIDDEN_STEMS.get(branch, [])
         if hidden:
             main_stem = hidden[0][0]
-            tg = get_ten_god(day_stem, main_stem)
+            tg, category = row[main_stem]
         else:
-            tg = ""
+            tg, category = "", ""
 
         # 지장간 전체 십성
         hidden_ten_gods = []
         for hs, days in hidden:
-            htg = get_ten_god(day_stem, hs)
+            htg, hcategory = row[hs]
             hidden_ten_gods.append({
                 "stem": hs,
                 "stem_ko": STEM_KO.get(hs, ""),
                 "ten_god": htg,
-                "category": TEN_GOD_CATEGORY.get(htg, ""),
+                "category": hcategory,
                 "days": days,
             })
 
@@ -89,7 +100,7 @@ def analyze_ten_gods(pillars: FourPillars) -> dict:
             "char": branch,
             "char_ko": BRANCH_KO.get(branch, ""),
             "ten_god": tg,
-            "category": TEN_GOD_CATEGORY.get(tg, ""),
+            "category": category,
             "position": label,
             "hidden_ten_gods": hidden_ten_gods,
         }
@@ -9,17 +9,51 @@ Phase 7: 용신 선정 알고리즘 (Yong-Shin Selection)
 """
 
 from __future__ import annotations
-from typing import Optional
+from functools import lru_cache
+from heapq import nlargest
+from typing import NamedTuple, Optional
 
 from .constants import (
     ELEMENTS, ELEMENT_KO, ELEMENT_EN,
-    ELEMENT_GENERATES, ELEMENT_CONTROLS,
-    STEM_ELEMENT, BRANCH_ELEMENT,
+    ELEMENT_GENERATES, ELEMENT_GENERATED_BY,
+    ELEMENT_CONTROLS, ELEMENT_CONTROLLED_BY,
+    BRANCH_ELEMENT,
     MONTH_TEMPERATURE,
 )
 from .calculator import FourPillars
 
 
+class _Selection(NamedTuple):
+    """용신 선정 핵심부 결과 (캐시되어 공유되는 불변 값)"""
+    yong_shin: str
+    hee_shin: str
+    gi_shin: str
+    reason: str
+    method: str
+
+
+# 오행 → (한글, 영문) 이름 (오행이 아닌 값은 _NO_INFO)
+_ELEMENT_INFO = {e: (ELEMENT_KO[e], ELEMENT_EN[e]) for e in ELEMENTS}
+_NO_INFO = ("", "")
+
+# 선정 근거 문구 템플릿
+_REASON_JOHU = "조후용신: {temperature} 사주로 온도 조절이 최우선입니다."
+_REASON_TONGGWAN = "통관용신: {e1_ko}과(와) {e2_ko}의 대립을 {mediator_ko}이(가) 중재합니다."
+_REASON_STRONG = "억부용신: 신강 사주이므로 기운을 설기하는 {ko}({elem})이(가) 필요합니다."
+_REASON_WEAK = "억부용신: 신약 사주이므로 기운을 보충하는 {ko}({elem})이(가) 필요합니다."
+_REASON_BALANCED = "중화 사주이지만 {ko}({elem})이(가) 부족하여 이를 보충합니다."
+
+# 조후용신 판정용 월령 온도 구분
+_HOT_TEMPERATURES = frozenset(("매우 뜨거움", "뜨거움"))
+_COLD_TEMPERATURES = frozenset(("매우 차가움", "차가움"))
+# 조후가 억부보다 우선하는 극단 온도
+_EXTREME_TEMPERATURES = frozenset(("매우 뜨거움", "매우 차가움"))
+
+# 억부용신 판정용 신강/신약 구분 (strength_level 값)
+_STRONG_LEVELS = frozenset(("strong", "very_strong"))
+_WEAK_LEVELS = frozenset(("weak", "very_weak"))
+
+
 def select_yong_shin(
     pillars: FourPillars,
     element_analysis: dict,
@@ -36,215 +70,260 @@ def select_yong_shin(
     Returns:
         용신/희신/기신 정보와 선정 근거
     """
-    day_element = STEM_ELEMENT[pillars.day.stem]
+    day_element = pillars.day_element
     strength_level = strength_analysis["strength_level"]
     month_branch = pillars.month.branch
     temperature = MONTH_TEMPERATURE.get(month_branch, "보통")
     stats = element_analysis["element_stats"]
 
-    # ─────── 1단계: 조후용신 체크 ───────
-    johu_needed = _check_johu(temperature, day_element, stats)
+    # 선정에 쓰이는 오행별 (점수, 비율)만 모은 해시 가능한 키
+    stats_key = tuple((stats[e]["score"], stats[e]["ratio"]) for e in ELEMENTS)
 
-    # ─────── 2단계: 통관용신 체크 ───────
-    tonggwan_needed = _check_tonggwan(stats)
+    sel = _select_yong_shin_cached(day_element, strength_level, temperature, stats_key)
+    yong_ko, yong_en = _ELEMENT_INFO.get(sel.yong_shin, _NO_INFO)
+    hee_ko = _ELEMENT_INFO.get(sel.hee_shin, _NO_INFO)[0]
+    gi_ko = _ELEMENT_INFO.get(sel.gi_shin, _NO_INFO)[0]
 
-    # ─────── 3단계: 억부용신 결정 ───────
-    yong_shin, hee_shin, gi_shin, reason = _select_by_strength(
-        day_element, strength_level, stats
-    )
+    return {
+        "yong_shin": sel.yong_shin,
+        "yong_shin_ko": yong_ko,
+        "yong_shin_en": yong_en,
+        "hee_shin": sel.hee_shin,
+        "hee_shin_ko": hee_ko,
+        "gi_shin": sel.gi_shin,
+        "gi_shin_ko": gi_ko,
+        "selection_method": sel.method,
+        "selection_reason": sel.reason,
+        "temperature": temperature,
+        "recommendations": _get_recommendations(sel.yong_shin, sel.hee_shin),
+    }
 
-    # 조후가 필요하면 조후 우선
-    if johu_needed and temperature in ("매우 뜨거움", "매우 차가움"):
-        yong_shin = johu_needed
-        reason = f"조후용신: {temperature} 사주로 온도 조절이 최우선입니다."
 
-    # 통관이 필요하면 통관 우선
+@lru_cache(maxsize=2048)
+def _select_yong_shin_cached(
+    day_element: str,
+    strength_level: str,
+    temperature: str,
+    stats_key: tuple[tuple[float, float], ...],
+) -> _Selection:
+    """
+    용신 선정 핵심부. 일간 오행, 신강/신약, 월령 온도, 오행별 (점수, 비율)만으로
+    결정되므로 결과를 메모이즈합니다.
+
+    Returns:
+        용신, 희신, 기신, 선정 근거, 선정 방법
+    """
+    # 오행별 점수/비율과 30% 이상 오행을 한 번에 정리
+    scores = []
+    ratios = {}
+    high_elements = []
+    for e, (score, ratio) in zip(ELEMENTS, stats_key):
+        scores.append(score)
+        ratios[e] = ratio
+        if ratio >= 30:
+            high_elements.append(e)
+
+    # ─────── 1단계: 조후용신 체크 ───────
+    # 더우면 水, 추우면 火로 온도를 조절
+    if temperature in _HOT_TEMPERATURES:
+        johu_needed = "水"
+    elif temperature in _COLD_TEMPERATURES:
+        johu_needed = "火"
+    else:
+        johu_needed = ""
+
+    # ─────── 2단계: 통관용신 체크 ───────
+    tonggwan_needed = _check_tonggwan(high_elements, ratios)
+
+    # ─────── 3단계: 용신 결정 (통관 > 조후 > 억부) ───────
     if tonggwan_needed:
+        # 통관이 필요하면 통관 우선
         yong_shin = tonggwan_needed["mediator"]
-        reason = (
-            f"통관용신: {ELEMENT_KO[tonggwan_needed['element1']]}과(와) "
-            f"{ELEMENT_KO[tonggwan_needed['element2']]}의 대립을 "
-            f"{ELEMENT_KO[tonggwan_needed['mediator']]}이(가) 중재합니다."
+        reason = _REASON_TONGGWAN.format(
+            e1_ko=_ELEMENT_INFO[tonggwan_needed["element1"]][0],
+            e2_ko=_ELEMENT_INFO[tonggwan_needed["element2"]][0],
+            mediator_ko=_ELEMENT_INFO[yong_shin][0],
         )
+    elif johu_needed and temperature in _EXTREME_TEMPERATURES:
+        # 조후가 필요하면 조후 우선
+        yong_shin = johu_needed
+        reason = _REASON_JOHU.format(temperature=temperature)
+    else:
+        yong_shin = ""
 
-    # 기신은 용신을 극하는 오행
-    if not gi_shin:
-        gi_shin = ELEMENT_CONTROLS.get(
-            next((e for e in ELEMENTS if ELEMENT_CONTROLS[e] == yong_shin), ""), ""
+    if yong_shin:
+        # 통관/조후 용신: 희신은 용신이 생하는 오행, 기신은 용신을 극하는 오행
+        hee_shin = ELEMENT_GENERATES[yong_shin]
+        gi_shin = ELEMENT_CONTROLLED_BY[yong_shin]
+    else:
+        # 억부용신 (통관/조후가 아닐 때만 계산)
+        yong_shin, hee_shin, gi_shin, reason = _select_by_strength(
+            day_element, strength_level, tuple(scores)
         )
-        # 기신: 용신을 극하는 오행
-        for e in ELEMENTS:
-            if ELEMENT_CONTROLS[e] == yong_shin:
-                gi_shin = e
-                break
 
-    return {
-        "yong_shin": yong_shin,
-        "yong_shin_ko": ELEMENT_KO.get(yong_shin, ""),
-        "yong_shin_en": ELEMENT_EN.get(yong_shin, ""),
-        "hee_shin": hee_shin,
-        "hee_shin_ko": ELEMENT_KO.get(hee_shin, ""),
-        "gi_shin": gi_shin,
-        "gi_shin_ko": ELEMENT_KO.get(gi_shin, ""),
-        "selection_method": _get_method_name(johu_needed, tonggwan_needed),
-        "selection_reason": reason,
-        "temperature": temperature,
-        "recommendations": _get_recommendations(yong_shin, hee_shin),
-    }
+    if johu_needed:
+        method = "조후용신(調候用神)"
+    elif tonggwan_needed:
+        method = "통관용신(通關用神)"
+    else:
+        method = "억부용신(抑扶用神)"
 
+    return _Selection(yong_shin, hee_shin, gi_shin, reason, method)
 
-def _check_johu(temperature: str, day_element: str, stats: dict) -> str:
-    """조후용신 필요 여부 체크"""
-    if temperature in ("매우 뜨거움", "뜨거움"):
-        return "水"
-    if temperature in ("매우 차가움", "차가움"):
-        return "火"
-    return ""
 
+# 상극 관계인 두 오행 (순서 무관) → 통관 중재 오행
+# 극하는 쪽(a)이 생하는 오행이 a → 중재 → b 로 기운을 흘려보냅니다.
+_MEDIATOR_TABLE = {
+    pair: ELEMENT_GENERATES[a]
+    for a in ELEMENTS
+    for pair in ((a, ELEMENT_CONTROLS[a]), (ELEMENT_CONTROLS[a], a))
+}
 
-def _check_tonggwan(stats: dict) -> dict | None:
+
+def _check_tonggwan(high_elements: list[str], ratios: dict) -> dict | None:
     """
     통관용신 필요 여부 체크.
     두 오행이 각각 30% 이상이면 대립으로 간주.
+
+    Args:
+        high_elements: 비율 30% 이상인 오행 (ELEMENTS 순서)
+        ratios: 오행별 비율
     """
-    high_elements = [e for e in ELEMENTS if stats[e]["ratio"] >= 30]
-
-    if len(high_elements) >= 2:
-        e1, e2 = high_elements[0], high_elements[1]
-        # 두 오행이 상극 관계인지 확인
-        if ELEMENT_CONTROLS[e1] == e2 or ELEMENT_CONTROLS[e2] == e1:
-            # 중재자: e1이 e2를 극하면 → e1이 생하는 오행이 중재
-            if ELEMENT_CONTROLS[e1] == e2:
-                mediator = ELEMENT_GENERATES[e1]
-            else:
-                mediator = ELEMENT_GENERATES[e2]
-            return {
-                "element1": e1,
-                "element2": e2,
-                "mediator": mediator,
-            }
-    return None
+    if len(high_elements) < 2:
+        return None
+
+    # 비율이 가장 높은 두 오행 (동률이면 ELEMENTS 순서)
+    e1, e2 = nlargest(2, high_elements, key=ratios.__getitem__)
+    # 상극 관계인 두 오행이 아니면 통관 불필요
+    mediator = _MEDIATOR_TABLE.get((e1, e2))
+    if mediator is None:
+        return None
+    return {
+        "element1": e1,
+        "element2": e2,
+        "mediator": mediator,
+    }
 
 
+@lru_cache(maxsize=4096)
 def _select_by_strength(
     day_element: str,
     strength_level: str,
-    stats: dict,
+    score_values: tuple[float, ...],
 ) -> tuple[str, str, str, str]:
-    """억부용신 결정"""
+    """
+    억부용신 결정.
+    score_values는 ELEMENTS 순서의 오행별 점수(소수 첫째 자리 반올림 값)이며,
+    입력이 모두 해시 가능하므로 결과를 메모이즈합니다.
+    """
+    scores = dict(zip(ELEMENTS, score_values))
 
     # 일간을 생하는 오행 (인성)
-    insung_element = ""
-    for e in ELEMENTS:
-        if ELEMENT_GENERATES[e] == day_element:
-            insung_element = e
-            break
+    insung_element = ELEMENT_GENERATED_BY[day_element]
 
     # 일간이 생하는 오행 (식상)
     siksang_element = ELEMENT_GENERATES[day_element]
     # 일간이 극하는 오행 (재성)
     jaesung_element = ELEMENT_CONTROLS[day_element]
     # 일간을 극하는 오행 (관성)
-    gwansung_element = ""
-    for e in ELEMENTS:
-        if ELEMENT_CONTROLS[e] == day_element:
-            gwansung_element = e
-            break
+    gwansung_element = ELEMENT_CONTROLLED_BY[day_element]
 
-    if strength_level in ("strong", "very_strong"):
+    if strength_level in _STRONG_LEVELS:
         # 신강: 기운을 설기(泄氣)해야 함 → 식상/재성/관성 필요
         # 최적: 가장 약한 식/재/관 중 선택
-        candidates = [
-            (siksang_element, stats[siksang_element]["score"]),
-            (jaesung_element, stats[jaesung_element]["score"]),
-            (gwansung_element, stats[gwansung_element]["score"]),
-        ]
-        # 가장 점수가 낮은(=가장 필요한) 것을 용신으로
-        candidates.sort(key=lambda x: x[1])
-        yong_shin = candidates[0][0]
-        hee_shin = candidates[1][0]
+        # 가장 점수가 낮은(=가장 필요한) 것을 용신, 그다음을 희신으로
+        # (동점이면 식상 → 재성 → 관성 순)
+        candidates = (siksang_element, jaesung_element, gwansung_element)
+        yong_shin = min(candidates, key=scores.__getitem__)
+        hee_shin = min((e for e in candidates if e != yong_shin), key=scores.__getitem__)
         gi_shin = insung_element  # 인성은 기신 (더 강하게 만드므로)
 
-        reason = (
-            f"억부용신: 신강 사주이므로 기운을 설기하는 "
-            f"{ELEMENT_KO[yong_shin]}({yong_shin})이(가) 필요합니다."
-        )
+        reason = _REASON_STRONG.format(ko=_ELEMENT_INFO[yong_shin][0], elem=yong_shin)
 
-    elif strength_level in ("weak", "very_weak"):
+    elif strength_level in _WEAK_LEVELS:
         # 신약: 기운을 보충해야 함 → 인성/비겁 필요
-        candidates = [
-            (insung_element, stats[insung_element]["score"]),
-            (day_element, stats[day_element]["score"]),  # 비겁
-        ]
-        candidates.sort(key=lambda x: x[1])
-        yong_shin = candidates[0][0]
-        hee_shin = candidates[1][0]
+        # 인성/비겁 중 점수가 낮은 쪽이 용신 (동점이면 인성)
+        if scores[insung_element] <= scores[day_element]:
+            yong_shin, hee_shin = insung_element, day_element
+        else:
+            yong_shin, hee_shin = day_element, insung_element
         gi_shin = gwansung_element  # 관성은 기신 (더 약하게 만드므로)
 
-        reason = (
-            f"억부용신: 신약 사주이므로 기운을 보충하는 "
-            f"{ELEMENT_KO[yong_shin]}({yong_shin})이(가) 필요합니다."
-        )
+        reason = _REASON_WEAK.format(ko=_ELEMENT_INFO[yong_shin][0], elem=yong_shin)
 
     else:
         # 중화: 가장 부족한 오행을 보충
-        weakest = min(ELEMENTS, key=lambda e: stats[e]["score"])
+        weakest = min(ELEMENTS, key=scores.__getitem__)
         yong_shin = weakest
         hee_shin = ELEMENT_GENERATES.get(weakest, "")
-        # 기신: 가장 과한 오행
-        strongest = max(ELEMENTS, key=lambda e: stats[e]["score"] if e != day_element else 0)
+        # 기신: 일간 오행을 제외하고 가장 과한 오행
+        strongest = max((e for e in ELEMENTS if e != day_element), key=scores.__getitem__)
         gi_shin = strongest
 
-        reason = (
-            f"중화 사주이지만 {ELEMENT_KO[weakest]}({weakest})이(가) "
-            f"부족하여 이를 보충합니다."
-        )
+        reason = _REASON_BALANCED.format(ko=_ELEMENT_INFO[weakest][0], elem=weakest)
 
     return yong_shin, hee_shin, gi_shin, reason
 
 
-def _get_method_name(johu: str, tonggwan: dict | None) -> str:
-    if johu:
-        return "조후용신(調候用神)"
-    if tonggwan:
-        return "통관용신(通關用神)"
-    return "억부용신(抑扶用神)"
+# ─────── 용신 오행별 생활 추천 테이블 ───────
+
+_COLOR_MAP = {
+    "木": ("초록색", "청색"),
+    "火": ("빨간색", "보라색"),
+    "土": ("노란색", "갈색"),
+    "金": ("흰색", "은색"),
+    "水": ("검정색", "파란색"),
+}
+_DIRECTION_MAP = {
+    "木": "동쪽",
+    "火": "남쪽",
+    "土": "중앙",
+    "金": "서쪽",
+    "水": "북쪽",
+}
+_NUMBER_MAP = {
+    "木": (3, 8),
+    "火": (2, 7),
+    "土": (5, 10),
+    "金": (4, 9),
+    "水": (1, 6),
+}
+_CAREER_MAP = {
+    "木": "교육, 출판, 패션, 의류, 농업, 원예 관련 분야",
+    "火": "방송, 연예, IT, 전기전자, 음식업 관련 분야",
+    "土": "부동산, 건설, 농업, 중개업 관련 분야",
+    "金": "금융, 법률, 의료, 기계, 자동차 관련 분야",
+    "水": "무역, 물류, 유통, 수산업, 관광 관련 분야",
+}
+
+
+def _build_recommendations(yong_shin: str, hee_shin: str) -> dict:
+    """용신/희신 기반 생활 추천 dict 생성"""
+    return {
+        "lucky_colors": [*_COLOR_MAP.get(yong_shin, ()), *_COLOR_MAP.get(hee_shin, ())],
+        "lucky_direction": _DIRECTION_MAP.get(yong_shin, ""),
+        "lucky_numbers": list(_NUMBER_MAP.get(yong_shin, ())),
+        "career_advice": _CAREER_MAP.get(yong_shin, ""),
+    }
 
 
-def _get_recommendations(yong_shin: str, hee_shin: str) -> dict:
-    """용신/희신 기반 생활 추천"""
-    color_map = {
-        "木": ["초록색", "청색"],
-        "火": ["빨간색", "보라색"],
-        "土": ["노란색", "갈색"],
-        "金": ["흰색", "은색"],
-        "水": ["검정색", "파란색"],
-    }
-    direction_map = {
-        "木": "동쪽",
-        "火": "남쪽",
-        "土": "중앙",
-        "金": "서쪽",
-        "水": "북쪽",
-    }
-    number_map = {
-        "木": [3, 8],
-        "火": [2, 7],
-        "土": [5, 10],
-        "金": [4, 9],
-        "水": [1, 6],
-    }
-    career_map = {
-        "木": "교육, 출판, 패션, 의류, 농업, 원예 관련 분야",
-        "火": "방송, 연예, IT, 전기전자, 음식업 관련 분야",
-        "土": "부동산, 건설, 농업, 중개업 관련 분야",
-        "金": "금융, 법률, 의료, 기계, 자동차 관련 분야",
-        "水": "무역, 물류, 유통, 수산업, 관광 관련 분야",
-    }
+# (용신, 희신) → 추천 dict, 5 x 5 조합 (import 시 한 번만 계산, 읽기 전용)
+_RECOMMENDATIONS = {
+    (yong, hee): _build_recommendations(yong, hee)
+    for yong in ELEMENTS
+    for hee in ELEMENTS
+}
 
-    return {
-        "lucky_colors": color_map.get(yong_shin, []) + color_map.get(hee_shin, []),
-        "lucky_direction": direction_map.get(yong_shin, ""),
-        "lucky_numbers": number_map.get(yong_shin, []),
-        "career_advice": career_map.get(yong_shin, ""),
-    }
+
+# 오행이 아닌 용신/희신 값일 때의 빈 추천 (공유 객체, 읽기 전용)
+_DEFAULT_RECO = {
+    "lucky_colors": [],
+    "lucky_direction": "",
+    "lucky_numbers": [],
+    "career_advice": "",
+}
+
+
+def _get_recommendations(yong_shin: str, hee_shin: str) -> dict:
+    """용신/희신 기반 생활 추천 (반환값은 공유되므로 수정하지 않아야 합니다)"""
+    return _RECOMMENDATIONS.get((yong_shin, hee_shin), _DEFAULT_RECO)